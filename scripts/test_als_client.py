@@ -183,16 +183,15 @@ async def test_als_client():
 
         # Test 6: Check diagnostics
         print("\n[8] Checking diagnostics...")
-        async with client._diagnostics_lock:
-            diag_count = sum(len(d) for d in client._diagnostics.values())
-            if client._diagnostics:
-                print(f"    ✓ Have {diag_count} diagnostics from {len(client._diagnostics)} files")
-                for uri, diags in list(client._diagnostics.items())[:2]:
-                    fname = uri.split("/")[-1]
-                    print(f"      - {fname}: {len(diags)} diagnostics")
-            else:
-                print("    ✓ No diagnostics (code is clean)")
-            tests_passed += 1
+        diag_count = sum(len(d) for d in client._diagnostics.values())
+        if client._diagnostics:
+            print(f"    ✓ Have {diag_count} diagnostics from {len(client._diagnostics)} files")
+            for uri, diags in list(client._diagnostics.items())[:2]:
+                fname = uri.split("/")[-1]
+                print(f"      - {fname}: {len(diags)} diagnostics")
+        else:
+            print("    ✓ No diagnostics (code is clean)")
+        tests_passed += 1
 
     finally:
         print("\n[9] Shutting down ALS...")
@@ -25,8 +25,9 @@ def main() -> None:
     logger.info("Starting Ada MCP Server...")
 
     try:
-        from ada_mcp.server import run_server
+        from ada_mcp.server import install_event_loop_policy, run_server
 
+        install_event_loop_policy()
         asyncio.run(run_server())
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
@@ -1,10 +1,18 @@
 """Async client for communicating with Ada Language Server via LSP."""
 
 import asyncio
+import functools
 import json
 import logging
+import os
+import secrets
 from typing import Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 from ada_mcp.als.types import (
     Diagnostic,
     DiagnosticSeverity,
@@ -12,6 +20,98 @@ from ada_mcp.als.types import (
 
 logger = logging.getLogger(__name__)
 
+# orjson parses the raw frame bytes directly; stdlib json accepts bytes too
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps(message: dict[str, Any]) -> bytes:
+    """Serialize an outgoing message straight to UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(message)
+    return json.dumps(message).encode("utf-8")
+
+
+# Read-only queries whose concurrent identical requests share one round-trip
+COALESCED_METHODS = frozenset(
+    {
+        "textDocument/definition",
+        "textDocument/declaration",
+        "textDocument/typeDefinition",
+        "textDocument/implementation",
+        "textDocument/hover",
+        "textDocument/references",
+        "textDocument/documentSymbol",
+        "workspace/symbol",
+    }
+)
+
+# Queries agents tend to fire in bursts; with ADA_MCP_DEBOUNCE_MS set these
+# wait briefly before being sent so identical requests arriving within the
+# window join the same round-trip. Off by default: the wait delays every call
+DEBOUNCED_METHODS = frozenset({"textDocument/definition", "textDocument/hover"})
+DEFAULT_DEBOUNCE_SECONDS = float(os.environ.get("ADA_MCP_DEBOUNCE_MS", "0")) / 1000
+
+
+class DiagnosticStore(dict[str, list[Diagnostic]]):
+    """
+    Published diagnostics keyed by URI, with a per-severity index.
+
+    The index is updated whenever a URI's diagnostics are replaced, so
+    severity-filtered queries only visit matching entries.
+    """
+
+    def __init__(self, initial: dict[str, list[Diagnostic]] | None = None):
+        super().__init__()
+        self.by_severity: dict[DiagnosticSeverity, dict[str, list[Diagnostic]]] = {}
+        self.counts: dict[DiagnosticSeverity, int] = {}
+        # Bumped on every change so pollers can tell when nothing was published.
+        # The epoch tells stores apart, since each new client starts from 0
+        self.version = 0
+        self.epoch = secrets.token_hex(4)
+        # Tool output records per URI and severity filter (None for all), filled by
+        # the diagnostics tool and dropped whenever the URI is republished
+        self.records: dict[str, dict[frozenset[DiagnosticSeverity] | None, list[Any]]] = {}
+        if initial:
+            self.update(initial)
+
+    @property
+    def token(self) -> str:
+        """Version token for pollers, unique across stores."""
+        return f"{self.epoch}-{self.version}"
+
+    def __setitem__(self, uri: str, diagnostics: list[Diagnostic]) -> None:
+        if uri in self:
+            self._unindex(uri)
+        super().__setitem__(uri, diagnostics)
+        self.version += 1
+        for diag in diagnostics:
+            self.by_severity.setdefault(diag.severity, {}).setdefault(uri, []).append(diag)
+            self.counts[diag.severity] = self.counts.get(diag.severity, 0) + 1
+
+    def __delitem__(self, uri: str) -> None:
+        self._unindex(uri)
+        super().__delitem__(uri)
+        self.version += 1
+
+    def update(self, other: dict[str, list[Diagnostic]]) -> None:  # type: ignore[override]
+        for uri, diagnostics in other.items():
+            self[uri] = diagnostics
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+        self.by_severity.clear()
+        self.counts.clear()
+        self.records.clear()
+
+    def _unindex(self, uri: str) -> None:
+        """Drop a URI's entries from the severity index and record cache."""
+        self.records.pop(uri, None)
+        for severity, bucket in self.by_severity.items():
+            removed = bucket.pop(uri, None)
+            if removed:
+                self.counts[severity] -= len(removed)
+
 
 class LSPError(Exception):
     """Raised when LSP returns an error response."""
@@ -26,17 +126,25 @@ class LSPError(Exception):
 class ALSClient:
     """Async client for communicating with Ada Language Server."""
 
-    def __init__(self, process: asyncio.subprocess.Process):
+    def __init__(
+        self,
+        process: asyncio.subprocess.Process,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+    ):
         self.process = process
+        self.debounce_seconds = debounce_seconds
         self._request_id = 0
         self._pending_requests: dict[int, asyncio.Future[Any]] = {}
+        self._inflight_requests: dict[tuple[str, str], asyncio.Task[Any]] = {}
+        self._outgoing: list[bytes] = []
         self._read_task: asyncio.Task[None] | None = None
         self._initialized = False
         self._server_capabilities: dict[str, Any] = {}
 
-        # Diagnostics are pushed via notifications, store them here
-        self._diagnostics: dict[str, list[Diagnostic]] = {}
-        self._diagnostics_lock = asyncio.Lock()
+        # Diagnostics are pushed via notifications, store them here. The store
+        # is only touched from the event loop by code that never awaits midway,
+        # so publishes and readers cannot interleave and no lock is needed
+        self._diagnostics = DiagnosticStore()
 
     @property
     def is_running(self) -> bool:
@@ -49,7 +157,46 @@ class ALSClient:
             self._read_task = asyncio.create_task(self._read_loop())
 
     async def send_request(self, method: str, params: dict[str, Any] | None = None) -> Any:
-        """Send LSP request and wait for response."""
+        """
+        Send LSP request and wait for response.
+
+        Read-only queries (see COALESCED_METHODS) are coalesced: a request
+        identical to one already in flight waits for that response instead
+        of sending another. DEBOUNCED_METHODS are held for debounce_seconds
+        before being sent, widening the window in which duplicates join.
+        """
+        if method not in COALESCED_METHODS:
+            return await self._send_request(method, params)
+
+        key = (method, json.dumps(params, sort_keys=True))
+        task = self._inflight_requests.get(key)
+        if task is None:
+            if method in DEBOUNCED_METHODS and self.debounce_seconds > 0:
+                task = asyncio.create_task(self._send_request_debounced(method, params))
+            else:
+                task = asyncio.create_task(self._send_request(method, params))
+            self._inflight_requests[key] = task
+            task.add_done_callback(functools.partial(self._forget_inflight, key))
+        else:
+            logger.debug(f"Joining in-flight request: {method}")
+        # Shield so one caller's cancellation doesn't cancel the others
+        return await asyncio.shield(task)
+
+    def _forget_inflight(self, key: tuple[str, str], task: asyncio.Task[Any]) -> None:
+        """Drop a finished coalesced request from the in-flight map."""
+        if self._inflight_requests.get(key) is task:
+            del self._inflight_requests[key]
+        if not task.cancelled():
+            # Mark the exception retrieved, callers re-raise it themselves
+            task.exception()
+
+    async def _send_request_debounced(self, method: str, params: dict[str, Any] | None) -> Any:
+        """Wait out the debounce window, then send the request."""
+        await asyncio.sleep(self.debounce_seconds)
+        return await self._send_request(method, params)
+
+    async def _send_request(self, method: str, params: dict[str, Any] | None) -> Any:
+        """Send a single LSP request and wait for its response."""
         if not self.is_running:
             raise LSPError(-1, "ALS process is not running")
 
@@ -68,14 +215,28 @@ class ALSClient:
         self._pending_requests[request_id] = future
 
         logger.debug(f"Sending request {request_id}: {method}")
-        await self._write_message(request)
-
         try:
+            await self._write_message(request)
             result = await asyncio.wait_for(future, timeout=30.0)
             return result
         except TimeoutError:
-            self._pending_requests.pop(request_id, None)
+            self._cancel_request(request_id)
             raise LSPError(-1, f"Request {method} timed out")
+        except asyncio.CancelledError:
+            self._cancel_request(request_id)
+            raise
+        finally:
+            # Timed out or cancelled requests must not be answered later
+            self._pending_requests.pop(request_id, None)
+
+    def _cancel_request(self, request_id: int) -> None:
+        """Tell ALS to stop working on a request whose reply nobody awaits."""
+        if not self.is_running or self.process.stdin is None:
+            return
+        logger.debug(f"Cancelling request {request_id}")
+        self._queue_message(
+            {"jsonrpc": "2.0", "method": "$/cancelRequest", "params": {"id": request_id}}
+        )
 
     async def send_notification(self, method: str, params: dict[str, Any] | None = None) -> None:
         """Send LSP notification (no response expected)."""
@@ -113,65 +274,69 @@ class ALSClient:
         if self.process.stdin is None:
             raise LSPError(-1, "ALS stdin is not available")
 
-        content = json.dumps(message)
-        content_bytes = content.encode("utf-8")
-        header = f"Content-Length: {len(content_bytes)}\r\n\r\n"
+        self._queue_message(message)
 
-        self.process.stdin.write(header.encode("utf-8") + content_bytes)
+        # Let the flush run before applying flow control
+        await asyncio.sleep(0)
         await self.process.stdin.drain()
 
+    def _queue_message(self, message: dict[str, Any]) -> None:
+        """Queue a JSON-RPC message for the next write to ALS stdin."""
+        content = _json_dumps(message)
+        first_frame = not self._outgoing
+        # Header and body are queued separately; the flush joins everything once
+        self._outgoing.append(b"Content-Length: %d\r\n\r\n" % len(content))
+        self._outgoing.append(content)
+        if first_frame:
+            # First frame of a batch: flush once the current tasks have run, so
+            # frames queued by other requests in this loop tick share one write
+            asyncio.get_running_loop().call_soon(self._flush_outgoing)
+
+    def _flush_outgoing(self) -> None:
+        """Write all queued frames to ALS stdin in a single call."""
+        data = b"".join(self._outgoing)
+        self._outgoing.clear()
+        if self.process.stdin is None:
+            logger.warning(f"Dropping {len(data)} bytes, ALS stdin is not available")
+            return
+        self.process.stdin.write(data)
+
     async def _read_loop(self) -> None:
         """Read responses and notifications from ALS stdout."""
         if self.process.stdout is None:
             logger.error("ALS stdout is not available")
             return
 
+        stdout = self.process.stdout
         try:
             while self.is_running:
-                # Read headers
-                headers: dict[str, str] = {}
-                while True:
-                    line = await self.process.stdout.readline()
-                    if not line:
-                        logger.info("ALS stdout closed")
-                        return
-
-                    line_str = line.decode("utf-8").strip()
-                    if not line_str:
-                        break  # Empty line separates headers from content
-
-                    if ": " in line_str:
-                        key, value = line_str.split(": ", 1)
-                        headers[key] = value
-
-                # Get content length
-                content_length_str = headers.get("Content-Length")
-                if content_length_str is None:
+                # Read the whole header block in one call; StreamReader
+                # already buffers, so no per-line or per-chunk copies
+                try:
+                    header_block = await stdout.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    logger.info("ALS stdout closed")
+                    return
+
+                content_length = None
+                for header in header_block.split(b"\r\n"):
+                    key, sep, value = header.partition(b": ")
+                    if sep and key == b"Content-Length":
+                        content_length = int(value)
+
+                if content_length is None:
                     logger.warning("Missing Content-Length header")
                     continue
 
-                content_length = int(content_length_str)
-
-                # Read content - may need multiple reads for large messages
-                content = b""
-                remaining = content_length
-                while remaining > 0:
-                    chunk = await self.process.stdout.read(remaining)
-                    if not chunk:
-                        logger.warning(
-                            f"Incomplete message: got {len(content)}, expected {content_length}"
-                        )
-                        break
-                    content += chunk
-                    remaining -= len(chunk)
-
-                if len(content) < content_length:
+                try:
+                    content = await stdout.readexactly(content_length)
+                except asyncio.IncompleteReadError as e:
                     logger.warning(
-                        f"Incomplete message: got {len(content)}, expected {content_length}"
+                        f"Incomplete message: got {len(e.partial)}, expected {content_length}"
                     )
-                    continue
+                    return
 
-                message = json.loads(content.decode("utf-8"))
+                message = _json_loads(content)
                 await self._handle_message(message)
 
         except asyncio.CancelledError:
@@ -217,6 +382,9 @@ class ALSClient:
             if future is None:
                 logger.warning(f"Received response for unknown request {request_id}")
                 return
+            if future.done():
+                logger.debug(f"Dropping response for abandoned request {request_id}")
+                return
 
             if "error" in message:
                 error = message["error"]
@@ -251,8 +419,7 @@ class ALSClient:
 
         diagnostics = [Diagnostic.from_dict(d) for d in diagnostics_data]
 
-        async with self._diagnostics_lock:
-            self._diagnostics[uri] = diagnostics
+        self._diagnostics[uri] = diagnostics
 
         logger.debug(f"Received {len(diagnostics)} diagnostics for {uri}")
 
@@ -279,19 +446,14 @@ class ALSClient:
         self, uri: str | None = None, severity: DiagnosticSeverity | None = None
     ) -> dict[str, list[Diagnostic]]:
         """Get cached diagnostics, optionally filtered by URI and severity."""
-        async with self._diagnostics_lock:
-            if uri is not None:
-                diagnostics = {uri: self._diagnostics.get(uri, [])}
-            else:
-                diagnostics = dict(self._diagnostics)
-
         if severity is not None:
-            filtered: dict[str, list[Diagnostic]] = {}
-            for file_uri, diags in diagnostics.items():
-                filtered[file_uri] = [d for d in diags if d.severity == severity]
-            return filtered
-
-        return diagnostics
+            bucket = self._diagnostics.by_severity.get(severity, {})
+            if uri is not None:
+                return {uri: list(bucket.get(uri, []))}
+            return {file_uri: list(bucket.get(file_uri, [])) for file_uri in self._diagnostics}
+        if uri is not None:
+            return {uri: self._diagnostics.get(uri, [])}
+        return dict(self._diagnostics)
 
     async def shutdown(self) -> None:
         """Send shutdown request and exit notification."""
@@ -38,6 +38,26 @@ class ALSHealthMonitor:
     _monitor_task: asyncio.Task | None = field(default=None, init=False)
     _shutdown_requested: bool = field(default=False, init=False)
     _on_restart_callback: Callable[["ALSClient"], None] | None = field(default=None, init=False)
+    _backoff_table: tuple[float, ...] = field(default=(), init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._backoff_table = tuple(
+            self._compute_backoff(attempt) for attempt in range(self.max_restart_attempts)
+        )
+
+    def _compute_backoff(self, attempt: int) -> float:
+        """Compute the capped backoff delay for a restart attempt."""
+        if self.backoff_multiplier == 2:
+            factor: float = 1 << attempt
+        else:
+            factor = self.backoff_multiplier**attempt
+        return min(self.initial_backoff_seconds * factor, self.max_backoff_seconds)
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        """Return the backoff delay for a restart attempt."""
+        if attempt < len(self._backoff_table):
+            return self._backoff_table[attempt]
+        return self._compute_backoff(attempt)
 
     def start_monitoring(self, on_restart: Callable[["ALSClient"], None] | None = None) -> None:
         """Start the health monitoring background task."""
@@ -86,11 +106,7 @@ class ALSHealthMonitor:
             )
             return
 
-        # Calculate backoff delay
-        backoff = min(
-            self.initial_backoff_seconds * (self.backoff_multiplier**self.restart_count),
-            self.max_backoff_seconds,
-        )
+        backoff = self._backoff_seconds(self.restart_count)
 
         logger.info(
             f"Attempting ALS restart in {backoff:.1f}s "
@@ -45,7 +45,7 @@ class SymbolKind(IntEnum):
     TYPE_PARAMETER = 26
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """LSP position (0-based line and character)."""
 
@@ -60,7 +60,7 @@ class Position:
         return cls(line=data["line"], character=data["character"])
 
 
-@dataclass
+@dataclass(slots=True)
 class Range:
     """LSP range with start and end positions."""
 
@@ -68,14 +68,26 @@ class Range:
     end: Position
 
     def to_dict(self) -> dict[str, Any]:
-        return {"start": self.start.to_dict(), "end": self.end.to_dict()}
+        # Built inline rather than through Position.to_dict, ranges are encoded
+        # once per diagnostic and location
+        start = self.start
+        end = self.end
+        return {
+            "start": {"line": start.line, "character": start.character},
+            "end": {"line": end.line, "character": end.character},
+        }
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Range":
-        return cls(start=Position.from_dict(data["start"]), end=Position.from_dict(data["end"]))
+        start = data["start"]
+        end = data["end"]
+        return cls(
+            Position(start["line"], start["character"]),
+            Position(end["line"], end["character"]),
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     """LSP location (URI + range)."""
 
@@ -90,7 +102,7 @@ class Location:
         return cls(uri=data["uri"], range=Range.from_dict(data["range"]))
 
 
-@dataclass
+@dataclass(slots=True)
 class Diagnostic:
     """LSP diagnostic (error, warning, etc.)."""
 
@@ -111,7 +123,7 @@ class Diagnostic:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentSymbol:
     """LSP document symbol."""
 
@@ -135,7 +147,7 @@ class DocumentSymbol:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolInformation:
     """LSP workspace symbol information."""
 
@@ -154,7 +166,7 @@ class SymbolInformation:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CompletionItem:
     """LSP completion item."""
 
@@ -178,7 +190,7 @@ class CompletionItem:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Hover:
     """LSP hover result."""
 
@@ -204,7 +216,7 @@ class Hover:
         return cls(contents=contents, range=Range.from_dict(range_data) if range_data else None)
 
 
-@dataclass
+@dataclass(slots=True)
 class TextDocumentIdentifier:
     """LSP text document identifier."""
 
@@ -214,7 +226,7 @@ class TextDocumentIdentifier:
         return {"uri": self.uri}
 
 
-@dataclass
+@dataclass(slots=True)
 class TextDocumentPositionParams:
     """LSP text document position parameters."""
 
@@ -1,11 +1,13 @@
 """MCP Server setup and tool registration for Ada Language Server."""
 
 import asyncio
-import json
 import logging
 import os
+import time
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -45,6 +47,17 @@ from ada_mcp.tools.refactoring import (
     handle_rename_symbol,
     handle_signature_help,
 )
+from ada_mcp.utils import jsonio
+
+__all__ = [
+    "call_tool",
+    "get_als_client",
+    "install_event_loop_policy",
+    "list_tools",
+    "run_server",
+    "server",
+    "shutdown_als_client",
+]
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +103,7 @@ class ALSPool:
         self.max_instances = max_instances
         self.idle_timeout = idle_timeout
         self._instances: dict[Path, ALSInstance] = {}
+        self._starting: dict[Path, asyncio.Task[ALSClient]] = {}
         self._pool_lock = asyncio.Lock()
         self._cleanup_task: asyncio.Task | None = None
 
@@ -113,16 +127,7 @@ class ALSPool:
         Returns:
             ALSClient for the appropriate project
         """
-        import time
-
-        # Determine project root
-        project_root_env = os.environ.get("ADA_PROJECT_ROOT")
-        if project_root_env:
-            project_root = Path(project_root_env)
-        elif file_path:
-            project_root = find_project_root(Path(file_path))
-        else:
-            project_root = Path.cwd()
+        project_root = self._project_root_for(file_path)
 
         async with self._pool_lock:
             # Check if we already have an instance for this project
@@ -137,55 +142,94 @@ class ALSPool:
                     logger.warning(f"ALS instance for {project_root} died, removing")
                     del self._instances[project_root]
 
-            # Need to create a new instance
-            # First, check if we need to evict old instances
-            await self._evict_if_needed()
+            # Join a start already in progress for this project, or begin one.
+            # The start runs outside the pool lock so other projects stay usable
+            starting = self._starting.get(project_root)
+            if starting is None:
+                # First, check if we need to evict old instances
+                await self._evict_if_needed()
 
-            logger.info(f"Creating new ALS instance for project: {project_root}")
+                logger.info(f"Creating new ALS instance for project: {project_root}")
+                starting = asyncio.create_task(self._start_instance(project_root))
+                self._starting[project_root] = starting
+
+        return await asyncio.shield(starting)
+
+    def prewarm(self, file_path: str | None = None) -> asyncio.Task[ALSClient]:
+        """
+        Start the ALS for a project in the background.
 
+        The first tool call for that project then reuses the running
+        instance instead of paying the ALS startup and indexing delay.
+
+        Args:
+            file_path: File path to determine project from
+
+        Returns:
+            Task resolving to the started client
+        """
+        task = asyncio.create_task(self.get_client(file_path))
+        task.add_done_callback(self._log_prewarm_result)
+        return task
+
+    @staticmethod
+    def _log_prewarm_result(task: asyncio.Task[ALSClient]) -> None:
+        """Report a failed prewarm; the next tool call will retry the start."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"ALS prewarm failed: {task.exception()}")
+
+    @staticmethod
+    def _project_root_for(file_path: str | None) -> Path:
+        """Determine the project root a file belongs to."""
+        project_root_env = os.environ.get("ADA_PROJECT_ROOT")
+        if project_root_env:
+            return Path(project_root_env)
+        elif file_path:
+            return find_project_root(Path(file_path))
+        return Path.cwd()
+
+    async def _start_instance(self, project_root: Path) -> ALSClient:
+        """Start an ALS for a project and register it once it is ready."""
+        try:
+            client, monitor = await start_als_with_monitoring(
+                project_root, on_restart=self._create_restart_callback(project_root)
+            )
+
+            # Give ALS time to index
             try:
-                client, monitor = await start_als_with_monitoring(
-                    project_root, on_restart=self._create_restart_callback(project_root)
-                )
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                await shutdown_als(client, monitor)
+                raise
 
-                instance = ALSInstance(
+            async with self._pool_lock:
+                self._instances[project_root] = ALSInstance(
                     client=client,
                     monitor=monitor,
                     project_root=project_root,
                     last_used=time.time(),
                     lock=asyncio.Lock(),
                 )
-                self._instances[project_root] = instance
-
-                # Give ALS time to index
-                await asyncio.sleep(1.0)
 
                 # Start cleanup task if not running
                 if self._cleanup_task is None or self._cleanup_task.done():
                     self._cleanup_task = asyncio.create_task(self._cleanup_loop())
 
-                return client
+            return client
 
-            except Exception as e:
-                logger.exception(f"Failed to start ALS for {project_root}: {e}")
-                raise
+        except Exception as e:
+            logger.exception(f"Failed to start ALS for {project_root}: {e}")
+            raise
+        finally:
+            self._starting.pop(project_root, None)
 
     async def _evict_if_needed(self) -> None:
-        """Evict oldest instance if at capacity."""
-
-        if len(self._instances) < self.max_instances:
-            return
-
-        # Find the oldest (least recently used) instance
-        oldest_root = None
-        oldest_time = float("inf")
-
-        for root, instance in self._instances.items():
-            if instance.last_used < oldest_time:
-                oldest_time = instance.last_used
-                oldest_root = root
-
-        if oldest_root:
+        """Evict least recently used instances until a new one fits (must hold pool lock)."""
+        # Instances still starting will register shortly, so they count too
+        while self._instances and (
+            len(self._instances) + len(self._starting) >= self.max_instances
+        ):
+            oldest_root = min(self._instances, key=lambda root: self._instances[root].last_used)
             logger.info(f"Evicting ALS instance for {oldest_root} (LRU)")
             await self._shutdown_instance(oldest_root)
 
@@ -202,8 +246,6 @@ class ALSPool:
 
     async def _cleanup_loop(self) -> None:
         """Periodically clean up idle instances."""
-        import time
-
         while True:
             try:
                 await asyncio.sleep(60.0)  # Check every minute
@@ -238,13 +280,14 @@ class ALSPool:
             if self._cleanup_task:
                 self._cleanup_task.cancel()
 
+            for starting in self._starting.values():
+                starting.cancel()
+
             for root in list(self._instances.keys()):
                 await self._shutdown_instance(root)
 
     def get_stats(self) -> dict:
         """Get pool statistics."""
-        import time
-
         now = time.time()
         return {
             "active_instances": len(self._instances),
@@ -343,6 +386,22 @@ async def list_tools() -> list[Tool]:
                         "description": "Filter by severity level",
                         "default": "all",
                     },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Number of diagnostics to skip, for paging",
+                        "default": 0,
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of diagnostics to return (omit for all)",
+                    },
+                    "since_version": {
+                        "type": "string",
+                        "description": (
+                            "Version from a previous response; returns only "
+                            "{unchanged: true} if nothing changed since"
+                        ),
+                    },
                 },
                 "required": [],
             },
@@ -721,191 +780,197 @@ async def list_tools() -> list[Tool]:
     ]
 
 
+# Bare miss returned by lookup handlers; encoded once and reused
+_NOT_FOUND: dict[str, Any] = {"found": False}
+_NOT_FOUND_CONTENT = TextContent(type="text", text=jsonio.dumps(_NOT_FOUND, indent=True))
+
+# Tool name -> coroutine factory taking the ALS client and the tool arguments
+_TOOL_HANDLERS: dict[str, Callable[[ALSClient, dict], Awaitable[dict[str, Any]]]] = {
+    "ada_goto_definition": lambda client, args: handle_goto_definition(
+        client,
+        file=args["file"],
+        line=args["line"],
+        column=args["column"],
+    ),
+    "ada_hover": lambda client, args: handle_hover(
+        client,
+        file=args["file"],
+        line=args["line"],
+        column=args["column"],
+    ),
+    "ada_diagnostics": lambda client, args: handle_diagnostics(
+        client,
+        file=args.get("file"),
+        severity=args.get("severity", "all"),
+        offset=args.get("offset", 0),
+        limit=args.get("limit"),
+        since_version=args.get("since_version"),
+    ),
+    "ada_find_references": lambda client, args: handle_find_references(
+        client,
+        file=args["file"],
+        line=args["line"],
+        column=args["column"],
+        include_declaration=args.get("include_declaration", True),
+    ),
+    "ada_document_symbols": lambda client, args: handle_document_symbols(
+        client,
+        file=args["file"],
+    ),
+    "ada_workspace_symbols": lambda client, args: handle_workspace_symbols(
+        client,
+        query=args["query"],
+        kind=args.get("kind", "all"),
+        limit=args.get("limit", 50),
+    ),
+    "ada_type_definition": lambda client, args: handle_type_definition(
+        client,
+        file=args["file"],
+        line=args["line"],
+        column=args["column"],
+    ),
+    "ada_implementation": lambda client, args: handle_implementation(
+        client,
+        file=args["file"],
+        line=args["line"],
+        column=args["column"],
+    ),
+    "ada_project_info": lambda client, args: handle_project_info(
+        gpr_file=args["gpr_file"],
+    ),
+    "ada_call_hierarchy": lambda client, args: handle_call_hierarchy(
+        client,
+        file=args["file"],
+        line=args["line"],
+        column=args["column"],
+        direction=args.get("direction", "outgoing"),
+    ),
+    "ada_dependency_graph": lambda client, args: handle_dependency_graph(
+        file=args["file"],
+    ),
+    "ada_completions": lambda client, args: handle_completions(
+        client,
+        file=args["file"],
+        line=args["line"],
+        column=args["column"],
+        trigger_character=args.get("trigger_character"),
+        limit=args.get("limit", 50),
+    ),
+    "ada_signature_help": lambda client, args: handle_signature_help(
+        client,
+        file=args["file"],
+        line=args["line"],
+        column=args["column"],
+    ),
+    "ada_code_actions": lambda client, args: handle_code_actions(
+        client,
+        file=args["file"],
+        start_line=args["start_line"],
+        start_column=args["start_column"],
+        end_line=args.get("end_line"),
+        end_column=args.get("end_column"),
+    ),
+    "ada_rename_symbol": lambda client, args: handle_rename_symbol(
+        client,
+        file=args["file"],
+        line=args["line"],
+        column=args["column"],
+        new_name=args["new_name"],
+        preview=args.get("preview", True),
+    ),
+    "ada_format_file": lambda client, args: handle_format_file(
+        client,
+        file=args["file"],
+        tab_size=args.get("tab_size", 3),
+        insert_spaces=args.get("insert_spaces", True),
+    ),
+    "ada_get_spec": lambda client, args: handle_get_spec(
+        client,
+        file=args["file"],
+        line=args.get("line"),
+        column=args.get("column"),
+    ),
+    "ada_build": lambda client, args: handle_build(
+        gpr_file=args.get("gpr_file"),
+        target=args.get("target"),
+        clean=args.get("clean", False),
+        extra_args=args.get("extra_args"),
+    ),
+    "ada_alire_info": lambda client, args: handle_alire_info(
+        project_dir=args.get("project_dir"),
+    ),
+}
+
+
 @server.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Handle tool invocations."""
+    result = await _call_tool_raw(name, arguments)
+    if result == _NOT_FOUND:
+        return [_NOT_FOUND_CONTENT]
+    return [TextContent(type="text", text=jsonio.dumps(result, indent=True))]
+
+
+async def _call_tool_raw(name: str, arguments: dict) -> dict[str, Any]:
+    """Run a tool and return its result before JSON encoding."""
     logger.debug(f"Tool called: {name} with args: {arguments}")
 
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is None:
+        return {
+            "error": f"Unknown tool: {name}",
+            "available_tools": "Use list_tools to see available tools",
+        }
+
     # Extract file path from arguments for project detection
     file_path = arguments.get("file") or arguments.get("gpr_file")
 
     try:
         client = await get_als_client(file_path=file_path)
     except Exception as e:
-        error_result = {
+        return {
             "error": f"Failed to connect to ALS: {e}",
             "context": {"tool": name, "file": file_path},
             "hint": "Check that the Ada Language Server is installed and ALS_PATH is set correctly",
         }
-        return [TextContent(type="text", text=json.dumps(error_result, indent=2))]
 
     try:
-        match name:
-            case "ada_goto_definition":
-                result = await handle_goto_definition(
-                    client,
-                    file=arguments["file"],
-                    line=arguments["line"],
-                    column=arguments["column"],
-                )
-
-            case "ada_hover":
-                result = await handle_hover(
-                    client,
-                    file=arguments["file"],
-                    line=arguments["line"],
-                    column=arguments["column"],
-                )
-
-            case "ada_diagnostics":
-                result = await handle_diagnostics(
-                    client,
-                    file=arguments.get("file"),
-                    severity=arguments.get("severity", "all"),
-                )
-
-            case "ada_find_references":
-                result = await handle_find_references(
-                    client,
-                    file=arguments["file"],
-                    line=arguments["line"],
-                    column=arguments["column"],
-                    include_declaration=arguments.get("include_declaration", True),
-                )
-
-            case "ada_document_symbols":
-                result = await handle_document_symbols(
-                    client,
-                    file=arguments["file"],
-                )
-
-            case "ada_workspace_symbols":
-                result = await handle_workspace_symbols(
-                    client,
-                    query=arguments["query"],
-                    kind=arguments.get("kind", "all"),
-                    limit=arguments.get("limit", 50),
-                )
-
-            case "ada_type_definition":
-                result = await handle_type_definition(
-                    client,
-                    file=arguments["file"],
-                    line=arguments["line"],
-                    column=arguments["column"],
-                )
-
-            case "ada_implementation":
-                result = await handle_implementation(
-                    client,
-                    file=arguments["file"],
-                    line=arguments["line"],
-                    column=arguments["column"],
-                )
-
-            case "ada_project_info":
-                result = await handle_project_info(
-                    gpr_file=arguments["gpr_file"],
-                )
-
-            case "ada_call_hierarchy":
-                result = await handle_call_hierarchy(
-                    client,
-                    file=arguments["file"],
-                    line=arguments["line"],
-                    column=arguments["column"],
-                    direction=arguments.get("direction", "outgoing"),
-                )
-
-            case "ada_dependency_graph":
-                result = await handle_dependency_graph(
-                    file=arguments["file"],
-                )
-
-            case "ada_completions":
-                result = await handle_completions(
-                    client,
-                    file=arguments["file"],
-                    line=arguments["line"],
-                    column=arguments["column"],
-                    trigger_character=arguments.get("trigger_character"),
-                    limit=arguments.get("limit", 50),
-                )
-
-            case "ada_signature_help":
-                result = await handle_signature_help(
-                    client,
-                    file=arguments["file"],
-                    line=arguments["line"],
-                    column=arguments["column"],
-                )
-
-            case "ada_code_actions":
-                result = await handle_code_actions(
-                    client,
-                    file=arguments["file"],
-                    start_line=arguments["start_line"],
-                    start_column=arguments["start_column"],
-                    end_line=arguments.get("end_line"),
-                    end_column=arguments.get("end_column"),
-                )
-
-            case "ada_rename_symbol":
-                result = await handle_rename_symbol(
-                    client,
-                    file=arguments["file"],
-                    line=arguments["line"],
-                    column=arguments["column"],
-                    new_name=arguments["new_name"],
-                    preview=arguments.get("preview", True),
-                )
-
-            case "ada_format_file":
-                result = await handle_format_file(
-                    client,
-                    file=arguments["file"],
-                    tab_size=arguments.get("tab_size", 3),
-                    insert_spaces=arguments.get("insert_spaces", True),
-                )
-
-            case "ada_get_spec":
-                result = await handle_get_spec(
-                    client,
-                    file=arguments["file"],
-                    line=arguments.get("line"),
-                    column=arguments.get("column"),
-                )
-
-            case "ada_build":
-                result = await handle_build(
-                    gpr_file=arguments.get("gpr_file"),
-                    target=arguments.get("target"),
-                    clean=arguments.get("clean", False),
-                    extra_args=arguments.get("extra_args"),
-                )
-
-            case "ada_alire_info":
-                result = await handle_alire_info(
-                    project_dir=arguments.get("project_dir"),
-                )
-
-            case _:
-                result = {"error": f"Unknown tool: {name}", "available_tools": "Use list_tools to see available tools"}
-
+        return await handler(client, arguments)
     except Exception as e:
         logger.exception(f"Error executing tool {name}: {e}")
-        result = {
+        return {
             "error": str(e),
             "context": {"tool": name, "arguments": arguments},
         }
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+def install_event_loop_policy() -> bool:
+    """
+    Use uvloop's event loop when it is installed.
+
+    Must be called before the event loop is created.
+
+    Returns:
+        True if uvloop was installed, False if the default loop is kept
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Using uvloop event loop")
+    return True
 
 
 async def run_server() -> None:
     """Run the MCP server using stdio transport."""
     logger.info("Ada MCP Server starting...")
 
+    # Start the configured project's ALS while the client connects
+    if os.environ.get("ADA_PROJECT_ROOT") and os.environ.get("ADA_MCP_PREWARM", "1") != "0":
+        _als_pool.prewarm()
+
     try:
         async with stdio_server() as (read_stream, write_stream):
             await server.run(
@@ -1,19 +1,68 @@
 """Diagnostics tool: get compiler errors and warnings."""
 
 import logging
+from dataclasses import dataclass
+from itertools import chain, islice
 from typing import Any
 
 from ada_mcp.als.client import ALSClient
-from ada_mcp.als.types import DiagnosticSeverity
+from ada_mcp.als.types import Diagnostic, DiagnosticSeverity
 from ada_mcp.utils.uri import file_to_uri, uri_to_file
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
+class DiagnosticRecord:
+    """
+    One diagnostic as returned by ada_diagnostics (1-based positions).
+
+    Field names are the JSON keys of the tool output.
+    """
+
+    file: str
+    line: int
+    column: int
+    endLine: int  # noqa: N815
+    endColumn: int  # noqa: N815
+    severity: str
+    message: str
+    code: str | None
+    source: str
+
+
+# LSP severity to human-readable name
+_SEVERITY_NAMES: dict[DiagnosticSeverity, str] = {
+    DiagnosticSeverity.ERROR: "error",
+    DiagnosticSeverity.WARNING: "warning",
+    DiagnosticSeverity.INFORMATION: "info",
+    DiagnosticSeverity.HINT: "hint",
+}
+
+# Severity filter string to the LSP severities it includes ("all" is None)
+_SEVERITY_FILTERS: dict[str, frozenset[DiagnosticSeverity]] = {
+    "error": frozenset({DiagnosticSeverity.ERROR}),
+    "warning": frozenset({DiagnosticSeverity.WARNING}),
+    "hint": frozenset({DiagnosticSeverity.HINT, DiagnosticSeverity.INFORMATION}),
+    "info": frozenset({DiagnosticSeverity.INFORMATION}),
+}
+
+# LSP severity to the result count it contributes to
+_COUNT_FIELDS: dict[DiagnosticSeverity, str] = {
+    DiagnosticSeverity.ERROR: "errorCount",
+    DiagnosticSeverity.WARNING: "warningCount",
+    DiagnosticSeverity.INFORMATION: "hintCount",
+    DiagnosticSeverity.HINT: "hintCount",
+}
+
+
 async def handle_diagnostics(
     client: ALSClient,
     file: str | None = None,
     severity: str = "all",
+    offset: int = 0,
+    limit: int | None = None,
+    since_version: str | None = None,
 ) -> dict[str, Any]:
     """
     Get compiler diagnostics (errors, warnings) for Ada files.
@@ -22,89 +71,106 @@ async def handle_diagnostics(
         client: ALS client instance
         file: Absolute path to Ada file, or None for all files
         severity: Filter by severity - "error", "warning", "hint", or "all"
+        offset: Number of matching diagnostics to skip
+        limit: Maximum number of diagnostics to return, or None for all
+        since_version: Version from a previous response; if nothing has been
+            published to the same store since, only
+            {"unchanged": True, "version": ...} is returned
 
     Returns:
-        Dict with diagnostics list and counts
+        Dict with diagnostics list, counts and the store's version token
     """
-    # Get diagnostics from client's cache (populated via notifications)
-    async with client._diagnostics_lock:
-        all_diagnostics = dict(client._diagnostics)
-
-    # Filter by file if specified
-    if file:
-        file_uri = file_to_uri(file)
-        all_diagnostics = {uri: diags for uri, diags in all_diagnostics.items() if uri == file_uri}
+    store = client._diagnostics
+    version = store.token
+    if since_version is not None and since_version == version:
+        return {"unchanged": True, "version": version}
 
     # Map severity filter to LSP severity values
     severity_filter = _get_severity_filter(severity)
-
-    # Build result
-    result_diagnostics = []
-    error_count = 0
-    warning_count = 0
-    hint_count = 0
-
-    for uri, diags in all_diagnostics.items():
-        file_path = uri_to_file(uri)
-
-        for diag in diags:
-            # Filter by severity
-            if severity_filter and diag.severity not in severity_filter:
-                continue
-
-            diag_severity = _severity_to_string(diag.severity)
-
-            # Count by severity
-            if diag.severity == DiagnosticSeverity.ERROR:
-                error_count += 1
-            elif diag.severity == DiagnosticSeverity.WARNING:
-                warning_count += 1
-            elif diag.severity in (DiagnosticSeverity.INFORMATION, DiagnosticSeverity.HINT):
-                hint_count += 1
-
-            result_diagnostics.append(
-                {
-                    "file": file_path,
-                    "line": diag.range.start.line + 1,  # Convert to 1-based
-                    "column": diag.range.start.character + 1,
-                    "endLine": diag.range.end.line + 1,
-                    "endColumn": diag.range.end.character + 1,
-                    "severity": diag_severity,
-                    "message": diag.message,
-                    "code": diag.code,
-                    "source": diag.source or "ada",
-                }
-            )
+    file_uri = file_to_uri(file) if file else None
+
+    # Collect converted records from the client's store (populated via
+    # notifications). Files are visited in publish order and each file's
+    # diagnostics keep their published order; the severity index only
+    # decides which files match. Records are converted once per publish and
+    # filter, and reused until the URI is republished.
+    # Nothing here awaits, so a publish cannot interleave with this snapshot
+    pages: list[list[DiagnosticRecord]] = []
+    counts = dict.fromkeys(("errorCount", "warningCount", "hintCount"), 0)
+    buckets = [
+        (s, bucket)
+        for s, bucket in store.by_severity.items()
+        if severity_filter is None or s in severity_filter
+    ]
+    if file_uri is None:
+        uris = list(store)
+    else:
+        uris = [file_uri] if file_uri in store else []
+    for uri in uris:
+        sizes = [(s, len(bucket[uri])) for s, bucket in buckets if uri in bucket]
+        if not sizes:
+            continue
+        uri_records = store.records.setdefault(uri, {})
+        records = uri_records.get(severity_filter)
+        if records is None:
+            diags = store[uri]
+            if severity_filter is not None:
+                diags = [d for d in diags if d.severity in severity_filter]
+            records = uri_records[severity_filter] = _to_records(uri, diags)
+        pages.append(records)
+        # Counts come from bucket sizes, never from inspecting records
+        for s, n in sizes:
+            _add_count(counts, s, n)
+
+    # Counts and totals cover every match; only the requested page is copied
+    total = sum(len(records) for records in pages)
+    start = max(offset, 0)
+    stop = start + max(limit, 0) if limit is not None else None
+    result_diagnostics = list(islice(chain.from_iterable(pages), start, stop))
 
     return {
         "diagnostics": result_diagnostics,
-        "errorCount": error_count,
-        "warningCount": warning_count,
-        "hintCount": hint_count,
-        "totalCount": len(result_diagnostics),
+        **counts,
+        "totalCount": total,
+        "truncated": start + len(result_diagnostics) < total,
+        "version": version,
     }
 
 
-def _get_severity_filter(severity: str) -> set[DiagnosticSeverity] | None:
-    """Get set of severity values to include based on filter string."""
-    if severity == "all":
-        return None  # Include all
+def _to_records(uri: str, diags: list[Diagnostic]) -> list[DiagnosticRecord]:
+    """Convert diagnostics for one file to 1-based tool output records."""
+    file_path = uri_to_file(uri)
+    severity_name = _SEVERITY_NAMES.get
+    records = []
+    for diag in diags:
+        start = diag.range.start
+        end = diag.range.end
+        records.append(
+            DiagnosticRecord(
+                file=file_path,
+                line=start.line + 1,  # Convert to 1-based
+                column=start.character + 1,
+                endLine=end.line + 1,
+                endColumn=end.character + 1,
+                severity=severity_name(diag.severity, "unknown"),
+                message=diag.message,
+                code=diag.code,
+                source=diag.source or "ada",
+            )
+        )
+    return records
 
-    severity_map = {
-        "error": {DiagnosticSeverity.ERROR},
-        "warning": {DiagnosticSeverity.WARNING},
-        "hint": {DiagnosticSeverity.HINT, DiagnosticSeverity.INFORMATION},
-        "info": {DiagnosticSeverity.INFORMATION},
-    }
 
-    return severity_map.get(severity.lower())
+def _add_count(counts: dict[str, int], severity: DiagnosticSeverity, n: int) -> None:
+    """Add n diagnostics of a severity to the matching result count."""
+    count_field = _COUNT_FIELDS.get(severity)
+    if count_field is not None:
+        counts[count_field] += n
 
 
-def _severity_to_string(severity: DiagnosticSeverity) -> str:
-    """Convert LSP severity to human-readable string."""
-    return {
-        DiagnosticSeverity.ERROR: "error",
-        DiagnosticSeverity.WARNING: "warning",
-        DiagnosticSeverity.INFORMATION: "info",
-        DiagnosticSeverity.HINT: "hint",
-    }.get(severity, "unknown")
+def _get_severity_filter(severity: str) -> frozenset[DiagnosticSeverity] | None:
+    """Get set of severity values to include based on filter string."""
+    if severity == "all":
+        return None  # Include all
+
+    return _SEVERITY_FILTERS.get(severity.lower())
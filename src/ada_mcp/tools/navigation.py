@@ -1,10 +1,17 @@
 """Navigation tools: goto definition, find references, hover."""
 
+import asyncio
+import hashlib
 import logging
+import os
+import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
 from ada_mcp.als.client import ALSClient, LSPError
+from ada_mcp.utils.cache import TTLCache, definition_cache, hover_cache
+from ada_mcp.utils.position import text_document_position
 from ada_mcp.utils.uri import file_to_uri, uri_to_file
 
 logger = logging.getLogger(__name__)
@@ -28,21 +35,25 @@ async def handle_goto_definition(
     Returns:
         Dict with definition location or not found status
     """
+    invalid = _validate_position(file, line, column)
+    if invalid is not None:
+        return invalid
+
+    cache_key = _position_cache_key("definition", file, line, column, _file_mtime(file))
+    if cache_key is not None:
+        cached = _get_current(definition_cache, cache_key)
+        if cached is not None:
+            return cached
+
     file_uri = file_to_uri(file)
 
     # Ensure file is open in ALS
-    await _ensure_file_open(client, file)
+    await _ensure_file_open(client, file, file_uri)
 
     try:
         result = await client.send_request(
             "textDocument/definition",
-            {
-                "textDocument": {"uri": file_uri},
-                "position": {
-                    "line": line - 1,  # Convert to 0-based
-                    "character": column - 1,
-                },
-            },
+            text_document_position(file_uri, line, column),
         )
     except LSPError as e:
         logger.error(f"LSP error in goto_definition: {e}")
@@ -80,13 +91,19 @@ async def handle_goto_definition(
     # Get preview line
     preview = await _get_line_preview(target_file, start.get("line", 0))
 
-    return {
+    definition = {
         "found": True,
         "file": target_file,
         "line": start.get("line", 0) + 1,  # Convert to 1-based
         "column": start.get("character", 0) + 1,
         "preview": preview,
     }
+    if cache_key is not None:
+        # The location and preview come from the target file, so a hit is
+        # only valid while that file is unchanged too
+        deps = ((target_file, _file_mtime(target_file)),)
+        await definition_cache.set(cache_key, (definition, deps), file=file)
+    return dict(definition)
 
 
 async def handle_find_references(
@@ -109,20 +126,25 @@ async def handle_find_references(
     Returns:
         Dict with list of references and count
     """
+    invalid = _validate_position(file, line, column)
+    if invalid is not None:
+        return {
+            "references": [],
+            "count": 0,
+            "error": invalid["error"],
+            "context": invalid["context"],
+        }
+
     file_uri = file_to_uri(file)
 
     # Ensure file is open in ALS
-    await _ensure_file_open(client, file)
+    await _ensure_file_open(client, file, file_uri)
 
     try:
         result = await client.send_request(
             "textDocument/references",
             {
-                "textDocument": {"uri": file_uri},
-                "position": {
-                    "line": line - 1,
-                    "character": column - 1,
-                },
+                **text_document_position(file_uri, line, column),
                 "context": {"includeDeclaration": include_declaration},
             },
         )
@@ -186,21 +208,19 @@ async def handle_type_definition(
     Returns:
         Dict with type definition location or not found status
     """
+    invalid = _validate_position(file, line, column)
+    if invalid is not None:
+        return invalid
+
     file_uri = file_to_uri(file)
 
     # Ensure file is open in ALS
-    await _ensure_file_open(client, file)
+    await _ensure_file_open(client, file, file_uri)
 
     try:
         result = await client.send_request(
             "textDocument/typeDefinition",
-            {
-                "textDocument": {"uri": file_uri},
-                "position": {
-                    "line": line - 1,  # Convert to 0-based
-                    "character": column - 1,
-                },
-            },
+            text_document_position(file_uri, line, column),
         )
     except LSPError as e:
         logger.error(f"LSP error in type_definition: {e}")
@@ -267,21 +287,19 @@ async def handle_implementation(
     Returns:
         Dict with implementation location or not found status
     """
+    invalid = _validate_position(file, line, column)
+    if invalid is not None:
+        return invalid
+
     file_uri = file_to_uri(file)
 
     # Ensure file is open in ALS
-    await _ensure_file_open(client, file)
+    await _ensure_file_open(client, file, file_uri)
 
     try:
         result = await client.send_request(
             "textDocument/implementation",
-            {
-                "textDocument": {"uri": file_uri},
-                "position": {
-                    "line": line - 1,  # Convert to 0-based
-                    "character": column - 1,
-                },
-            },
+            text_document_position(file_uri, line, column),
         )
     except LSPError as e:
         logger.error(f"LSP error in implementation: {e}")
@@ -344,21 +362,25 @@ async def handle_hover(
     Returns:
         Dict with hover information
     """
+    invalid = _validate_position(file, line, column)
+    if invalid is not None:
+        return invalid
+
+    cache_key = _position_cache_key("hover", file, line, column, await _content_hash(file))
+    if cache_key is not None:
+        cached = _get_current(hover_cache, cache_key)
+        if cached is not None:
+            return cached
+
     file_uri = file_to_uri(file)
 
     # Ensure file is open in ALS
-    await _ensure_file_open(client, file)
+    await _ensure_file_open(client, file, file_uri)
 
     try:
         result = await client.send_request(
             "textDocument/hover",
-            {
-                "textDocument": {"uri": file_uri},
-                "position": {
-                    "line": line - 1,
-                    "character": column - 1,
-                },
-            },
+            text_document_position(file_uri, line, column),
         )
     except LSPError as e:
         logger.error(f"LSP error in hover: {e}")
@@ -374,35 +396,172 @@ async def handle_hover(
     contents = result.get("contents", {})
 
     # Parse contents - can be string, MarkupContent, or MarkedString[]
-    if isinstance(contents, str):
-        text = contents
-    elif isinstance(contents, dict):
-        text = contents.get("value", str(contents))
-    elif isinstance(contents, list):
-        # Array of MarkedString
-        parts = []
-        for item in contents:
-            if isinstance(item, str):
-                parts.append(item)
-            elif isinstance(item, dict):
-                parts.append(item.get("value", str(item)))
-        text = "\n".join(parts)
-    else:
-        text = str(contents)
+    text = _hover_text(contents)
 
-    return {
+    hover = {
         "found": True,
         "contents": text,
     }
+    if cache_key is not None:
+        await hover_cache.set(cache_key, (hover, _hover_deps(file, line, column)), file=file)
+    return dict(hover)
+
+
+def _marked_string_text(item: str | dict[str, Any]) -> str:
+    """Text of a MarkedString or MarkupContent."""
+    if type(item) is str:
+        return item
+    value = item.get("value")
+    return value if value is not None else str(item)
+
+
+def _marked_array_text(items: list[Any]) -> str:
+    """Text of a MarkedString[], one entry per line."""
+    return "\n".join(_marked_string_text(item) for item in items if type(item) in (str, dict))
+
+
+# Hover contents type -> text extractor; anything else falls back to str()
+_HOVER_EXTRACTORS: dict[type, Callable[[Any], str]] = {
+    str: _marked_string_text,
+    dict: _marked_string_text,
+    list: _marked_array_text,
+}
+
+
+def _hover_text(contents: Any) -> str:
+    """Flatten LSP hover contents to plain text."""
+    return _HOVER_EXTRACTORS.get(type(contents), str)(contents)
+
+
+def _validate_position(file: str, line: int | None, column: int | None) -> dict[str, Any] | None:
+    """
+    Reject positions ALS can never resolve, before any round-trip.
+
+    Returns:
+        A not-found result describing the problem, or None if the input is usable
+    """
+    if not file or not file.strip():
+        error = "File path is required"
+    elif line is None or column is None:
+        error = "Line and column are required"
+    elif line < 1 or column < 1:
+        error = "Line and column are 1-based and must be at least 1"
+    else:
+        return None
+    return {
+        "found": False,
+        "error": error,
+        "context": {"file": file, "line": line, "column": column},
+    }
+
+
+def _position_cache_key(
+    kind: str, file: str, line: int, column: int, version: int | str | None
+) -> str | None:
+    """
+    Build a cache key for a lookup at a source position.
+
+    The key embeds a version of the file (modification time or content
+    hash), so edits never hit stale entries. Returns None if the file has
+    no version, in which case the lookup is not cached.
+    """
+    if version is None:
+        return None
+    return f"file:{os.path.normpath(file)}:{kind}:{line}:{column}:{version}"
+
+
+def _hover_deps(file: str, line: int, column: int) -> tuple[tuple[str, int | None], ...]:
+    """
+    Dependencies of a hover result: the declaring unit, if known.
+
+    Hover text comes from the declaring unit. Its file is taken from a
+    current goto-definition entry for the same position; without one the
+    cache TTL bounds how long edits elsewhere can go unnoticed.
+    """
+    key = _position_cache_key("definition", file, line, column, _file_mtime(file))
+    definition = _get_current(definition_cache, key) if key is not None else None
+    declaring_file = definition.get("file") if definition is not None else None
+    if declaring_file is None:
+        return ()
+    return ((declaring_file, _file_mtime(declaring_file)),)
+
+
+def _get_current(cache: TTLCache[Any], key: str) -> dict[str, Any] | None:
+    """
+    Return a copy of a cached result whose dependencies are unchanged.
+
+    Entries are (result, deps) pairs, where deps lists (path, mtime_ns) for
+    the files other than the queried one that the result was read from; a
+    None mtime records a file that was missing.
+    """
+    entry = cache.get_sync(key)
+    if entry is None:
+        return None
+    result, deps = entry
+    if any(_file_mtime(path) != mtime for path, mtime in deps):
+        return None
+    return dict(result)
+
+
+def _file_mtime(file: str) -> int | None:
+    """Return the file's modification time in nanoseconds, or None if missing."""
+    try:
+        return os.stat(file).st_mtime_ns
+    except OSError:
+        return None
+
+
+# Content digests per normalized path, kept as parallel dicts with the
+# (mtime_ns, size) stamp each digest was computed at
+_file_stamps: dict[str, tuple[int, int]] = {}
+_file_hashes: dict[str, str] = {}
+
+# Files modified this recently are always re-read: a second write within the
+# filesystem's timestamp granularity would leave the stamp unchanged
+_RACY_WINDOW_NS = 1_000_000_000
+
+
+async def _content_hash(file: str) -> str | None:
+    """
+    Return a short BLAKE2b digest of the file's contents, or None if unreadable.
+
+    The file is only re-read when its modification time or size changed
+    since the digest was last computed.
+    """
+    try:
+        st = os.stat(file)
+    except OSError:
+        return None
+
+    path = os.path.normpath(file)
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _file_stamps.get(path) == stamp:
+        return _file_hashes[path]
+
+    try:
+        # Read and hash in a worker thread, large units would stall the loop
+        digest = await asyncio.to_thread(_file_digest, file)
+    except OSError:
+        return None
+    if time.time_ns() - st.st_mtime_ns > _RACY_WINDOW_NS:
+        _file_stamps[path] = stamp
+        _file_hashes[path] = digest
+    return digest
+
+
+def _file_digest(file: str) -> str:
+    """Read a file and return its short BLAKE2b digest."""
+    return hashlib.blake2b(Path(file).read_bytes(), digest_size=8).hexdigest()
 
 
 # Cache of open files to avoid reopening
 _open_files: set[str] = set()
 
 
-async def _ensure_file_open(client: ALSClient, file_path: str) -> None:
-    """Ensure a file is open in ALS."""
-    file_uri = file_to_uri(file_path)
+async def _ensure_file_open(client: ALSClient, file_path: str, file_uri: str | None = None) -> None:
+    """Ensure a file is open in ALS; pass file_uri if the caller already has it."""
+    if file_uri is None:
+        file_uri = file_to_uri(file_path)
 
     if file_uri in _open_files:
         return
@@ -457,3 +616,5 @@ async def _get_line_preview(file_path: str, line_0based: int) -> str:
 def clear_open_files_cache() -> None:
     """Clear the open files cache (useful for testing)."""
     _open_files.clear()
+    _file_stamps.clear()
+    _file_hashes.clear()
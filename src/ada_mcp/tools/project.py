@@ -6,13 +6,40 @@ Provides tools for:
 - Dependency graph analysis
 """
 
+import asyncio
+import functools
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-from ..utils.position import to_lsp_position
+from ..utils.position import text_document_position
 from ..utils.uri import file_to_uri, uri_to_file
 
+# GPR attributes: project Name is / for Source_Dirs use ("src", ...); / ...
+PROJECT_NAME_PATTERN = re.compile(r"project\s+(\w+)\s+is", re.IGNORECASE)
+SOURCE_DIRS_PATTERN = re.compile(r"for\s+Source_Dirs\s+use\s*\((.*?)\);", re.IGNORECASE | re.DOTALL)
+OBJECT_DIR_PATTERN = re.compile(r'for\s+Object_Dir\s+use\s*"([^"]+)";', re.IGNORECASE)
+EXEC_DIR_PATTERN = re.compile(r'for\s+Exec_Dir\s+use\s*"([^"]+)";', re.IGNORECASE)
+MAIN_UNITS_PATTERN = re.compile(r"for\s+Main\s+use\s*\((.*?)\);", re.IGNORECASE | re.DOTALL)
+QUOTED_STRING_PATTERN = re.compile(r'"([^"]+)"')
+
+# Ada sources: the unit a file declares, and its with clauses. These match raw
+# bytes so sources are never decoded; [\w\x80-\xff] keeps UTF-8 encoded
+# identifier characters, and only the captured names are decoded
+UNIT_NAME_PATTERN = re.compile(
+    rb"(?:package|procedure|function)\s+(?:body\s+)?([\w\x80-\xff]+(?:\.[\w\x80-\xff]+)*)",
+    re.IGNORECASE,
+)
+WITH_CLAUSE_PATTERN = re.compile(
+    rb"^\s*with\s+([\w\x80-\xff.]+(?:\s*,\s*[\w\x80-\xff.]+)*)\s*;",
+    re.MULTILINE | re.IGNORECASE,
+)
+
+# Shared by every dependency graph scan; threads start on first use
+_SCAN_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ada-scan")
+
 
 def _to_dict(obj: Any) -> Any:
     """Recursively convert LSP objects to plain dictionaries."""
@@ -39,6 +66,9 @@ def _to_dict(obj: Any) -> Any:
 def parse_gpr_file(gpr_path: str | Path) -> dict[str, Any]:
     """Parse a GPR file to extract project information.
 
+    Results are cached per file and reused until its modification time or
+    size changes.
+
     Args:
         gpr_path: Path to the .gpr file
 
@@ -50,8 +80,10 @@ def parse_gpr_file(gpr_path: str | Path) -> dict[str, Any]:
         - exec_dir: Executable directory
         - main_units: List of main units
     """
-    gpr_path = Path(gpr_path)
-    if not gpr_path.exists():
+    gpr_path = os.path.realpath(gpr_path)
+    try:
+        st = os.stat(gpr_path)
+    except OSError:
         return {
             "project_name": None,
             "source_dirs": [],
@@ -60,40 +92,50 @@ def parse_gpr_file(gpr_path: str | Path) -> dict[str, Any]:
             "main_units": [],
         }
 
-    content = gpr_path.read_text()
+    info = _parse_gpr_cached(gpr_path, st.st_mtime_ns, st.st_size)
+    # Copy the lists so callers cannot mutate the cached result
+    return {
+        **info,
+        "source_dirs": list(info["source_dirs"]),
+        "main_units": list(info["main_units"]),
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_gpr_cached(gpr_path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """Read and parse a GPR file; the stat fields only key the cache."""
+    content = Path(gpr_path).read_text()
 
     # Extract project name: project ProjectName is
-    project_match = re.search(r"project\s+(\w+)\s+is", content, re.IGNORECASE)
+    project_match = PROJECT_NAME_PATTERN.search(content)
     project_name = project_match.group(1) if project_match else None
 
     # Extract source directories: for Source_Dirs use ("src", "other");
     source_dirs = []
-    source_pattern = r"for\s+Source_Dirs\s+use\s*\((.*?)\);"
-    source_match = re.search(source_pattern, content, re.IGNORECASE | re.DOTALL)
+    source_match = SOURCE_DIRS_PATTERN.search(content)
     if source_match:
         dirs_str = source_match.group(1)
         # Find all quoted strings
-        source_dirs = re.findall(r'"([^"]+)"', dirs_str)
+        source_dirs = QUOTED_STRING_PATTERN.findall(dirs_str)
 
     # Extract object directory: for Object_Dir use "obj";
     object_dir = None
-    obj_match = re.search(r'for\s+Object_Dir\s+use\s*"([^"]+)";', content, re.IGNORECASE)
+    obj_match = OBJECT_DIR_PATTERN.search(content)
     if obj_match:
         object_dir = obj_match.group(1)
 
     # Extract exec directory: for Exec_Dir use "bin";
     exec_dir = None
-    exec_match = re.search(r'for\s+Exec_Dir\s+use\s*"([^"]+)";', content, re.IGNORECASE)
+    exec_match = EXEC_DIR_PATTERN.search(content)
     if exec_match:
         exec_dir = exec_match.group(1)
 
     # Extract main units: for Main use ("main.adb", "test.adb");
     main_units = []
-    main_pattern = r"for\s+Main\s+use\s*\((.*?)\);"
-    main_match = re.search(main_pattern, content, re.IGNORECASE | re.DOTALL)
+    main_match = MAIN_UNITS_PATTERN.search(content)
     if main_match:
         mains_str = main_match.group(1)
-        main_units = re.findall(r'"([^"]+)"', mains_str)
+        main_units = QUOTED_STRING_PATTERN.findall(mains_str)
 
     return {
         "project_name": project_name,
@@ -113,30 +155,29 @@ async def handle_project_info(gpr_file: str) -> dict[str, Any]:
     Returns:
         Project information dictionary
     """
-    gpr_path = Path(gpr_file)
-    info = parse_gpr_file(gpr_path)
+    info = parse_gpr_file(gpr_file)
 
-    # Convert relative paths to absolute
-    base_dir = gpr_path.parent
+    # Resolve directories relative to the project file; os.path.realpath
+    # works on strings directly, with no intermediate Path objects
+    base_dir = os.path.dirname(gpr_file)
 
     # Make source directories absolute
-    absolute_source_dirs = []
-    for src_dir in info["source_dirs"]:
-        abs_path = (base_dir / src_dir).resolve()
-        absolute_source_dirs.append(str(abs_path))
+    absolute_source_dirs = [
+        os.path.realpath(os.path.join(base_dir, src_dir)) for src_dir in info["source_dirs"]
+    ]
 
     # Build object_dir path
     object_dir_str = None
     if info["object_dir"]:
-        object_dir_str = str((base_dir / info["object_dir"]).resolve())
+        object_dir_str = os.path.realpath(os.path.join(base_dir, info["object_dir"]))
 
     # Build exec_dir path
     exec_dir_str = None
     if info["exec_dir"]:
-        exec_dir_str = str((base_dir / info["exec_dir"]).resolve())
+        exec_dir_str = os.path.realpath(os.path.join(base_dir, info["exec_dir"]))
 
     return {
-        "project_file": str(gpr_path.resolve()),
+        "project_file": os.path.realpath(gpr_file),
         "project_name": info["project_name"],
         "source_dirs": absolute_source_dirs,
         "object_dir": object_dir_str,
@@ -161,12 +202,11 @@ async def handle_call_hierarchy(
         Dictionary with call hierarchy information
     """
     file_uri = file_to_uri(file)
-    lsp_pos = to_lsp_position(line, column)
 
     # First, prepare call hierarchy
     prepare_result = await als_client.send_request(
         "textDocument/prepareCallHierarchy",
-        {"textDocument": {"uri": file_uri}, "position": lsp_pos},
+        text_document_position(file_uri, line, column),
     )
 
     if not prepare_result:
@@ -178,45 +218,18 @@ async def handle_call_hierarchy(
     # Convert item to plain dict to avoid serialization issues
     item_dict = _to_dict(item)
 
-    outgoing = []
-    incoming = []
+    # Outgoing and incoming calls are independent, so request them together
+    want_outgoing = direction in ("outgoing", "both")
+    want_incoming = direction in ("incoming", "both")
+    requests = []
+    if want_outgoing:
+        requests.append(als_client.send_request("callHierarchy/outgoingCalls", {"item": item_dict}))
+    if want_incoming:
+        requests.append(als_client.send_request("callHierarchy/incomingCalls", {"item": item_dict}))
+    results = iter(await asyncio.gather(*requests))
 
-    # Get outgoing calls if requested
-    if direction in ("outgoing", "both"):
-        outgoing_result = await als_client.send_request(
-            "callHierarchy/outgoingCalls", {"item": item_dict}
-        )
-        if outgoing_result:
-            for call in outgoing_result:
-                to_item = call.get("to", {})
-                outgoing.append(
-                    {
-                        "name": to_item.get("name", ""),
-                        "kind": to_item.get("kind", 0),
-                        "file": uri_to_file(to_item.get("uri", "")),
-                        "line": to_item.get("range", {}).get("start", {}).get("line", 0) + 1,
-                        "column": to_item.get("range", {}).get("start", {}).get("character", 0) + 1,
-                    }
-                )
-
-    # Get incoming calls if requested
-    if direction in ("incoming", "both"):
-        incoming_result = await als_client.send_request(
-            "callHierarchy/incomingCalls", {"item": item_dict}
-        )
-        if incoming_result:
-            for call in incoming_result:
-                from_item = call.get("from", {})
-                incoming.append(
-                    {
-                        "name": from_item.get("name", ""),
-                        "kind": from_item.get("kind", 0),
-                        "file": uri_to_file(from_item.get("uri", "")),
-                        "line": from_item.get("range", {}).get("start", {}).get("line", 0) + 1,
-                        "column": from_item.get("range", {}).get("start", {}).get("character", 0)
-                        + 1,
-                    }
-                )
+    outgoing = _call_entries(next(results), "to") if want_outgoing else []
+    incoming = _call_entries(next(results), "from") if want_incoming else []
 
     return {
         "found": True,
@@ -228,6 +241,24 @@ async def handle_call_hierarchy(
     }
 
 
+def _call_entries(calls: list[dict[str, Any]] | None, key: str) -> list[dict[str, Any]]:
+    """Flatten outgoing ("to") or incoming ("from") calls to 1-based entries."""
+    entries = []
+    for call in calls or []:
+        item = call.get(key, {})
+        start = item.get("range", {}).get("start", {})
+        entries.append(
+            {
+                "name": item.get("name", ""),
+                "kind": item.get("kind", 0),
+                "file": uri_to_file(item.get("uri", "")),
+                "line": start.get("line", 0) + 1,
+                "column": start.get("character", 0) + 1,
+            }
+        )
+    return entries
+
+
 async def handle_dependency_graph(file: str) -> dict[str, Any]:
     """Handle ada_dependency_graph tool request.
 
@@ -244,48 +275,60 @@ async def handle_dependency_graph(file: str) -> dict[str, Any]:
     if not path.exists():
         return {"dependencies": [], "package_count": 0}
 
+    loop = asyncio.get_running_loop()
+
     # Collect all .ads and .adb files
     ada_files = []
     if path.is_dir():
-        ada_files = list(path.rglob("*.ads")) + list(path.rglob("*.adb"))
+        ada_files = await loop.run_in_executor(
+            _SCAN_EXECUTOR, lambda: list(path.rglob("*.ads")) + list(path.rglob("*.adb"))
+        )
     else:
         ada_files = [path]
 
-    # Parse dependencies from each file
+    # Read and scan files on the scan pool; results keep the file order
+    units = await asyncio.gather(
+        *(loop.run_in_executor(_SCAN_EXECUTOR, _scan_unit, f) for f in ada_files)
+    )
+
     dependencies = []
     seen_packages = set()
-
-    # Regex patterns for parsing
-    pkg_pattern = r"(?:package|procedure|function)\s+(?:body\s+)?(\w+(?:\.\w+)*)"
-    with_pattern = r"^\s*with\s+([\w.]+(?:\s*,\s*[\w.]+)*)\s*;"
-
-    for ada_file in ada_files:
-        content = ada_file.read_text()
-
-        # Extract package or procedure name from this file
-        pkg_match = re.search(pkg_pattern, content, re.IGNORECASE)
-        if not pkg_match:
+    for ada_file, unit in zip(ada_files, units, strict=True):
+        if unit is None:
             continue
 
-        package_name = pkg_match.group(1)
+        package_name, imported_packages = unit
         seen_packages.add(package_name)
 
-        # Find all 'with' clauses
-        with_clauses = re.findall(with_pattern, content, re.MULTILINE | re.IGNORECASE)
-
-        imported_packages = set()
-        for clause in with_clauses:
-            # Split by comma for multiple imports
-            packages = [p.strip() for p in clause.split(",")]
-            imported_packages.update(packages)
-
         if imported_packages:
             dependencies.append(
                 {
                     "package": package_name,
                     "file": str(ada_file),
-                    "depends_on": sorted(list(imported_packages)),
+                    "depends_on": sorted(imported_packages),
                 }
             )
 
     return {"dependencies": dependencies, "package_count": len(seen_packages)}
+
+
+def _scan_unit(ada_file: Path) -> tuple[str, set[str]] | None:
+    """Return the unit a source file declares and the packages it withs.
+
+    Returns None if the file declares no package, procedure or function.
+    """
+    content = ada_file.read_bytes()
+
+    # Extract package or procedure name from this file
+    pkg_match = UNIT_NAME_PATTERN.search(content)
+    if not pkg_match:
+        return None
+
+    # Find all 'with' clauses, splitting by comma for multiple imports
+    imported_packages = set()
+    for clause in WITH_CLAUSE_PATTERN.findall(content):
+        imported_packages.update(
+            p.strip().decode("utf-8", errors="replace") for p in clause.split(b",")
+        )
+
+    return pkg_match.group(1).decode("utf-8", errors="replace"), imported_packages
@@ -9,11 +9,17 @@ Provides tools for:
 - Spec/body navigation
 """
 
+import asyncio
+import functools
 import re
 from pathlib import Path
 from typing import Any
 
-from ..utils.position import from_lsp_position_dict, to_lsp_position
+from ..utils.position import (
+    from_lsp_position_dict,
+    text_document_position,
+    to_lsp_position,
+)
 from ..utils.uri import file_to_uri, uri_to_file
 
 # LSP Completion Item Kind mapping
@@ -45,6 +51,11 @@ COMPLETION_ITEM_KIND = {
     25: "TypeParameter",
 }
 
+# Kind names indexed by the LSP integer, so translation is a tuple lookup
+_COMPLETION_KIND_NAMES = tuple(
+    COMPLETION_ITEM_KIND.get(kind, "Unknown") for kind in range(max(COMPLETION_ITEM_KIND) + 1)
+)
+
 
 async def handle_completions(
     als_client,
@@ -68,13 +79,9 @@ async def handle_completions(
         Dictionary with completion items
     """
     file_uri = file_to_uri(file)
-    lsp_pos = to_lsp_position(line, column)
 
     # Build completion context if trigger character provided
-    params: dict[str, Any] = {
-        "textDocument": {"uri": file_uri},
-        "position": lsp_pos,
-    }
+    params = text_document_position(file_uri, line, column)
 
     if trigger_character:
         params["context"] = {
@@ -103,14 +110,19 @@ async def handle_completions(
         items = result if isinstance(result, list) else []
         is_incomplete = False
 
+    # Trim before translating so dropped items cost nothing; a trimmed list
+    # is reported as incomplete so the client knows more remain
+    if len(items) > limit:
+        items = items[:limit]
+        is_incomplete = True
+
     # Parse completion items
     completions = []
-    for item in items[:limit]:
-        kind_num = item.get("kind", 1)
+    for item in items:
         completions.append(
             {
                 "label": item.get("label", ""),
-                "kind": COMPLETION_ITEM_KIND.get(kind_num, "Unknown"),
+                "kind": _completion_kind_name(item.get("kind", 1)),
                 "detail": item.get("detail", ""),
                 "documentation": _extract_documentation(item.get("documentation")),
                 "insert_text": item.get("insertText", item.get("label", "")),
@@ -125,6 +137,13 @@ async def handle_completions(
     }
 
 
+def _completion_kind_name(kind: Any) -> str:
+    """Translate an LSP CompletionItemKind integer to its name."""
+    if type(kind) is int and 0 < kind < len(_COMPLETION_KIND_NAMES):
+        return _COMPLETION_KIND_NAMES[kind]
+    return "Unknown"
+
+
 def _extract_documentation(doc: Any) -> str:
     """Extract documentation string from various formats."""
     if doc is None:
@@ -155,14 +174,10 @@ async def handle_signature_help(
         Dictionary with signature information
     """
     file_uri = file_to_uri(file)
-    lsp_pos = to_lsp_position(line, column)
 
     result = await als_client.send_request(
         "textDocument/signatureHelp",
-        {
-            "textDocument": {"uri": file_uri},
-            "position": lsp_pos,
-        },
+        text_document_position(file_uri, line, column),
     )
 
     if not result or not result.get("signatures"):
@@ -287,24 +302,21 @@ async def handle_code_actions(
     }
 
 
-# Ada identifier validation pattern
-ADA_IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+# Ada identifier: a letter, then letters/digits with single underscores
+# between them (so no "__" and no trailing "_"); use with fullmatch
+ADA_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z](?:_?[A-Za-z0-9])*")
 
 
+@functools.lru_cache(maxsize=4096)
 def _is_valid_ada_identifier(name: str) -> bool:
-    """Check if name is a valid Ada identifier."""
-    if not name:
-        return False
-    # Check basic pattern
-    if not ADA_IDENTIFIER_PATTERN.match(name):
-        return False
-    # Check no consecutive underscores
-    if "__" in name:
-        return False
-    # Check doesn't end with underscore
-    if name.endswith("_"):
-        return False
-    return True
+    """Check if name is a valid Ada identifier (memoized; names repeat a lot)."""
+    return ADA_IDENTIFIER_PATTERN.fullmatch(name) is not None
+
+
+async def _discard_task(task: asyncio.Task[Any]) -> None:
+    """Cancel a task whose result is no longer needed and wait for it to finish."""
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
 
 
 async def handle_rename_symbol(
@@ -338,18 +350,28 @@ async def handle_rename_symbol(
         }
 
     file_uri = file_to_uri(file)
-    lsp_pos = to_lsp_position(line, column)
+    position_params = text_document_position(file_uri, line, column)
 
-    # First, check if rename is valid using prepareRename
-    prepare_result = await als_client.send_request(
-        "textDocument/prepareRename",
-        {
-            "textDocument": {"uri": file_uri},
-            "position": lsp_pos,
-        },
+    # Send prepareRename and rename together; the rename reply is only used
+    # once prepareRename confirms the symbol can be renamed. Discarding the
+    # rename task makes the client send $/cancelRequest for it
+    prepare_task = asyncio.create_task(
+        als_client.send_request("textDocument/prepareRename", position_params)
     )
+    rename_task = asyncio.create_task(
+        als_client.send_request(
+            "textDocument/rename",
+            {**position_params, "newName": new_name},
+        )
+    )
+    try:
+        prepare_result = await prepare_task
+    except BaseException:
+        await _discard_task(rename_task)
+        raise
 
     if not prepare_result:
+        await _discard_task(rename_task)
         return {
             "success": False,
             "error": "Cannot rename symbol at this location",
@@ -366,15 +388,7 @@ async def handle_rename_symbol(
             # It's a Range, we need to extract the text
             old_name = prepare_result.get("placeholder", "")
 
-    # Perform the rename
-    result = await als_client.send_request(
-        "textDocument/rename",
-        {
-            "textDocument": {"uri": file_uri},
-            "position": lsp_pos,
-            "newName": new_name,
-        },
-    )
+    result = await rename_task
 
     if not result:
         return {
@@ -519,15 +533,11 @@ async def handle_get_spec(
     # If line/column provided, use LSP to find declaration
     if line is not None and column is not None:
         file_uri = file_to_uri(file)
-        lsp_pos = to_lsp_position(line, column)
 
         # Use textDocument/declaration to find spec
         result = await als_client.send_request(
             "textDocument/declaration",
-            {
-                "textDocument": {"uri": file_uri},
-                "position": lsp_pos,
-            },
+            text_document_position(file_uri, line, column),
         )
 
         if result:
@@ -5,6 +5,7 @@ from typing import Any
 
 from ada_mcp.als.client import ALSClient, LSPError
 from ada_mcp.als.types import SymbolKind
+from ada_mcp.tools.navigation import _ensure_file_open
 from ada_mcp.utils.uri import file_to_uri, uri_to_file
 
 logger = logging.getLogger(__name__)
@@ -27,9 +28,7 @@ async def handle_document_symbols(
     file_uri = file_to_uri(file)
 
     # Ensure file is open
-    from ada_mcp.tools.navigation import _ensure_file_open
-
-    await _ensure_file_open(client, file)
+    await _ensure_file_open(client, file, file_uri)
 
     try:
         result = await client.send_request(
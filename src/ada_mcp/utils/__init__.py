@@ -1,7 +1,11 @@
 """Utility modules for Ada MCP Server."""
 
 from ada_mcp.utils.errors import ALSNotRunningError, safe_tool_handler
-from ada_mcp.utils.position import from_lsp_position, to_lsp_position
+from ada_mcp.utils.position import (
+    from_lsp_position,
+    text_document_position,
+    to_lsp_position,
+)
 from ada_mcp.utils.uri import file_to_uri, uri_to_file
 
 __all__ = [
@@ -9,6 +13,7 @@ __all__ = [
     "uri_to_file",
     "to_lsp_position",
     "from_lsp_position",
+    "text_document_position",
     "ALSNotRunningError",
     "safe_tool_handler",
 ]
@@ -6,7 +6,9 @@ import hashlib
 import json
 import logging
 import os
+import sys
 import time
+from collections import OrderedDict
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any, Generic, ParamSpec, TypeVar
@@ -18,13 +20,15 @@ P = ParamSpec("P")
 R = TypeVar("R")
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheEntry(Generic[T]):
     """Cache entry with value and expiration time."""
 
     value: T
     expires_at: float
     created_at: float = field(default_factory=time.monotonic)
+    size: int = 0
+    file: str | None = None
 
     def is_expired(self) -> bool:
         return time.monotonic() > self.expires_at
@@ -35,7 +39,7 @@ class CacheEntry(Generic[T]):
         return time.monotonic() - self.created_at
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheStats:
     """Statistics for cache performance monitoring."""
 
@@ -46,8 +50,9 @@ class CacheStats:
     @property
     def hit_rate(self) -> float:
         """Return cache hit rate as a percentage."""
-        total = self.hits + self.misses
-        return (self.hits / total * 100) if total > 0 else 0.0
+        hits = self.hits
+        total = hits + self.misses
+        return hits * 100.0 / total if total else 0.0
 
     def reset(self) -> None:
         """Reset all statistics."""
@@ -61,12 +66,26 @@ class TTLCache(Generic[T]):
     """
     Simple TTL-based cache for ALS responses.
 
-    Thread-safe via asyncio locks.
+    Entries are kept in least-recently-used order; once ``max_entries`` is
+    reached, expired entries are dropped first, then the least recently used.
+
+    Safe for concurrent asyncio tasks: reads are lock-free, mutations are
+    serialized by an asyncio lock. Besides the entry count, the cache can be
+    bounded by an approximate byte budget (``max_bytes``); entry sizes come
+    from ``sizer`` (``sys.getsizeof`` by default) and the oldest entries are
+    dropped first when the budget is exceeded.
     """
 
     ttl_seconds: float = 5.0
     max_entries: int = 1000
-    _cache: dict[str, CacheEntry[T]] = field(default_factory=dict)
+    max_bytes: int | None = None
+    sizer: Callable[[Any], int] | None = None
+    _cache: OrderedDict[str, CacheEntry[T]] = field(default_factory=OrderedDict)
+    _total_bytes: int = 0
+    _by_file: dict[str, set[str]] = field(default_factory=dict)
+    # "file:<path>:..." keys stored without file=, matched by prefix instead
+    _unfiled: set[str] = field(default_factory=set)
+    _inflight: dict[str, asyncio.Event] = field(default_factory=dict)
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
     _stats: CacheStats = field(default_factory=CacheStats)
 
@@ -80,51 +99,130 @@ class TTLCache(Generic[T]):
         """Return current number of cached entries."""
         return len(self._cache)
 
+    @property
+    def bytes(self) -> int:
+        """Return approximate memory used by cached values, in bytes."""
+        return self._total_bytes
+
+    def get_sync(self, key: str) -> T | None:
+        """
+        Get cached value without awaiting.
+
+        Expired entries are reported as misses but left in place; they are
+        evicted by the next ``get`` or ``set`` that takes the lock.
+        """
+        entry = self._cache.get(key)
+        if entry is None or entry.is_expired():
+            self._stats.misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self._stats.hits += 1
+        return entry.value
+
     async def get(self, key: str) -> T | None:
         """Get cached value if not expired."""
+        # Lock-free fast path: single dict lookups are atomic, only the
+        # expire-and-evict step needs the lock.
+        entry = self._cache.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        if not entry.is_expired():
+            self._cache.move_to_end(key)
+            self._stats.hits += 1
+            return entry.value
+
         async with self._lock:
+            # Re-check, the entry may have been replaced while waiting
             entry = self._cache.get(key)
-            if entry is None:
-                self._stats.misses += 1
-                return None
-            if entry.is_expired():
-                del self._cache[key]
-                self._stats.misses += 1
+            if entry is not None and not entry.is_expired():
+                self._cache.move_to_end(key)
+                self._stats.hits += 1
+                return entry.value
+            if entry is not None:
+                self._remove_unlocked(key)
                 self._stats.evictions += 1
-                return None
-            self._stats.hits += 1
-            return entry.value
+            self._stats.misses += 1
+            return None
 
-    async def set(self, key: str, value: T) -> None:
-        """Set cache value with TTL."""
+    async def set(self, key: str, value: T, *, file: str | None = None) -> None:
+        """
+        Set cache value with TTL.
+
+        Pass ``file`` to index the entry for ``invalidate_file``. Keys of
+        the form ``file:<path>:...`` stored without it are still matched,
+        by prefix.
+        """
         async with self._lock:
-            # Evict expired entries if at max capacity
-            if len(self._cache) >= self.max_entries:
+            # Evict expired entries if at max capacity, then least recently used
+            if len(self._cache) >= self.max_entries and key not in self._cache:
                 await self._evict_expired_unlocked()
+                while len(self._cache) >= self.max_entries:
+                    self._remove_unlocked(next(iter(self._cache)))
+                    self._stats.evictions += 1
 
+            size = self.sizer(value) if self.sizer is not None else sys.getsizeof(value)
+            file_path = os.path.normpath(file) if file is not None else None
+            self._remove_unlocked(key)
             self._cache[key] = CacheEntry(
-                value=value, expires_at=time.monotonic() + self.ttl_seconds
+                value=value,
+                expires_at=time.monotonic() + self.ttl_seconds,
+                size=size,
+                file=file_path,
             )
+            self._total_bytes += size
+
+            if file_path is not None:
+                self._by_file.setdefault(file_path, set()).add(key)
+            elif key.startswith("file:"):
+                self._unfiled.add(key)
+
+            if self.max_bytes is not None:
+                self._evict_over_budget_unlocked(self.max_bytes)
 
     async def get_or_set(self, key: str, factory: Callable[[], Any]) -> T:
-        """Get cached value or compute and cache it."""
-        cached = await self.get(key)
-        if cached is not None:
-            return cached
-
-        # Compute value
-        if asyncio.iscoroutinefunction(factory):
-            value = await factory()
-        else:
-            value = factory()
-
-        await self.set(key, value)
+        """
+        Get cached value or compute and cache it.
+
+        Concurrent misses on the same key share a single factory call; the
+        other callers wait for it and then read the cached value.
+        """
+        # Hit path completes before the first await
+        entry = self._cache.get(key)
+        if entry is not None and not entry.is_expired():
+            self._cache.move_to_end(key)
+            self._stats.hits += 1
+            return entry.value
+
+        while True:
+            cached = await self.get(key)
+            if cached is not None:
+                return cached
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            # If the computation fails, the next iteration computes it here
+            await pending.wait()
+
+        done = asyncio.Event()
+        self._inflight[key] = done
+        try:
+            # Compute value
+            if asyncio.iscoroutinefunction(factory):
+                value = await factory()
+            else:
+                value = factory()
+
+            await self.set(key, value)
+        finally:
+            del self._inflight[key]
+            done.set()
         return value
 
     async def invalidate(self, key: str) -> None:
         """Remove specific key from cache."""
         async with self._lock:
-            if self._cache.pop(key, None) is not None:
+            if self._remove_unlocked(key) is not None:
                 self._stats.evictions += 1
 
     async def invalidate_prefix(self, prefix: str) -> None:
@@ -132,20 +230,29 @@ class TTLCache(Generic[T]):
         async with self._lock:
             keys_to_remove = [k for k in self._cache if k.startswith(prefix)]
             for key in keys_to_remove:
-                del self._cache[key]
+                self._remove_unlocked(key)
                 self._stats.evictions += 1
 
     async def invalidate_file(self, file_path: str) -> None:
         """Invalidate all cache entries related to a file."""
         # Normalize file path for consistent matching
         normalized = os.path.normpath(file_path)
-        await self.invalidate_prefix(f"file:{normalized}")
+        async with self._lock:
+            prefix = f"file:{normalized}:"
+            keys = [*self._by_file.pop(normalized, ())]
+            keys += [k for k in self._unfiled if k.startswith(prefix)]
+            for key in keys:
+                if self._remove_unlocked(key) is not None:
+                    self._stats.evictions += 1
 
     async def clear(self) -> None:
         """Clear all cached entries."""
         async with self._lock:
             count = len(self._cache)
             self._cache.clear()
+            self._by_file.clear()
+            self._unfiled.clear()
+            self._total_bytes = 0
             self._stats.evictions += count
 
     async def _evict_expired_unlocked(self) -> None:
@@ -153,9 +260,30 @@ class TTLCache(Generic[T]):
         now = time.monotonic()
         keys_to_remove = [k for k, v in self._cache.items() if v.expires_at < now]
         for key in keys_to_remove:
-            del self._cache[key]
+            self._remove_unlocked(key)
             self._stats.evictions += 1
 
+    def _evict_over_budget_unlocked(self, max_bytes: int) -> None:
+        """Evict oldest entries until under the byte budget (must hold lock)."""
+        while self._total_bytes > max_bytes and self._cache:
+            self._remove_unlocked(next(iter(self._cache)))
+            self._stats.evictions += 1
+
+    def _remove_unlocked(self, key: str) -> CacheEntry[T] | None:
+        """Remove an entry and release its bytes (must hold lock)."""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+            if entry.file is None:
+                self._unfiled.discard(key)
+            else:
+                keys = self._by_file.get(entry.file)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._by_file[entry.file]
+        return entry
+
 
 def make_cache_key(*args: Any, **kwargs: Any) -> str:
     """Create a cache key from function arguments."""
@@ -231,6 +359,7 @@ def cached_with_file_invalidation(
                 file_path = args[0]
 
             # Build cache key with file prefix
+            normalized_path = None
             if file_path:
                 normalized_path = os.path.normpath(str(file_path))
                 cache_key = f"file:{normalized_path}:{key_prefix}:{make_cache_key(*args, **kwargs)}"
@@ -246,7 +375,7 @@ def cached_with_file_invalidation(
             # Call function and cache result
             logger.debug(f"Cache miss for {key_prefix} ({file_path})")
             result = await func(*args, **kwargs)
-            await cache.set(cache_key, result)
+            await cache.set(cache_key, result, file=normalized_path)
             return result
 
         return wrapper
@@ -259,63 +388,41 @@ _cache_ttl = float(os.environ.get("ADA_MCP_CACHE_TTL", "5"))
 
 # Global caches for different data types
 symbol_cache: TTLCache[Any] = TTLCache(ttl_seconds=10.0)
-hover_cache: TTLCache[Any] = TTLCache(ttl_seconds=30.0)
-definition_cache: TTLCache[Any] = TTLCache(ttl_seconds=_cache_ttl)
+hover_cache: TTLCache[Any] = TTLCache(ttl_seconds=30.0, max_entries=500)
+definition_cache: TTLCache[Any] = TTLCache(ttl_seconds=_cache_ttl, max_entries=500)
 references_cache: TTLCache[Any] = TTLCache(ttl_seconds=_cache_ttl)
 completions_cache: TTLCache[Any] = TTLCache(ttl_seconds=2.0)  # Short TTL for dynamic content
 
+_NAMED_CACHES: tuple[tuple[str, TTLCache[Any]], ...] = (
+    ("symbol_cache", symbol_cache),
+    ("hover_cache", hover_cache),
+    ("definition_cache", definition_cache),
+    ("references_cache", references_cache),
+    ("completions_cache", completions_cache),
+)
+
 
 async def invalidate_file_caches(file_path: str) -> None:
     """Invalidate all caches for a specific file."""
-    await symbol_cache.invalidate_file(file_path)
-    await hover_cache.invalidate_file(file_path)
-    await definition_cache.invalidate_file(file_path)
-    await references_cache.invalidate_file(file_path)
-    await completions_cache.invalidate_file(file_path)
+    await asyncio.gather(*(cache.invalidate_file(file_path) for _, cache in _NAMED_CACHES))
     logger.debug(f"Invalidated all caches for {file_path}")
 
 
 async def clear_all_caches() -> None:
     """Clear all caches."""
-    await symbol_cache.clear()
-    await hover_cache.clear()
-    await definition_cache.clear()
-    await references_cache.clear()
-    await completions_cache.clear()
+    await asyncio.gather(*(cache.clear() for _, cache in _NAMED_CACHES))
     logger.debug("Cleared all caches")
 
 
 def get_cache_stats() -> dict[str, dict[str, Any]]:
     """Get statistics for all caches."""
     return {
-        "symbol_cache": {
-            "size": symbol_cache.size,
-            "hits": symbol_cache.stats.hits,
-            "misses": symbol_cache.stats.misses,
-            "hit_rate": f"{symbol_cache.stats.hit_rate:.1f}%",
-        },
-        "hover_cache": {
-            "size": hover_cache.size,
-            "hits": hover_cache.stats.hits,
-            "misses": hover_cache.stats.misses,
-            "hit_rate": f"{hover_cache.stats.hit_rate:.1f}%",
-        },
-        "definition_cache": {
-            "size": definition_cache.size,
-            "hits": definition_cache.stats.hits,
-            "misses": definition_cache.stats.misses,
-            "hit_rate": f"{definition_cache.stats.hit_rate:.1f}%",
-        },
-        "references_cache": {
-            "size": references_cache.size,
-            "hits": references_cache.stats.hits,
-            "misses": references_cache.stats.misses,
-            "hit_rate": f"{references_cache.stats.hit_rate:.1f}%",
-        },
-        "completions_cache": {
-            "size": completions_cache.size,
-            "hits": completions_cache.stats.hits,
-            "misses": completions_cache.stats.misses,
-            "hit_rate": f"{completions_cache.stats.hit_rate:.1f}%",
-        },
+        name: {
+            "size": cache.size,
+            "bytes": cache.bytes,
+            "hits": cache.stats.hits,
+            "misses": cache.stats.misses,
+            "hit_rate": f"{cache.stats.hit_rate:.1f}%",
+        }
+        for name, cache in _NAMED_CACHES
     }
@@ -0,0 +1,70 @@
+"""JSON encoding helpers backed by orjson when it is installed."""
+
+import dataclasses
+import json
+import os
+from enum import Enum
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(obj: Any) -> Any:
+    """Encode the non-JSON types handlers may return (records, paths, enums, sets)."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # LSP types define their wire shape in to_dict (a Range's fields are
+        # not its JSON keys)
+        to_dict = getattr(obj, "to_dict", None)
+        if to_dict is not None:
+            return to_dict()
+        # Shallow, so nested dataclasses come back through here as well
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    if isinstance(obj, os.PathLike):
+        return os.fspath(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, *, indent: bool = False) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    Args:
+        obj: JSON-compatible object
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        # Passthrough routes dataclasses to _default instead of orjson's
+        # field-by-field encoding, which would ignore to_dict
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        # MCP TextContent needs str. A plain UTF-8 decode is already fast for
+        # ASCII input; checking isascii() first and decoding as ASCII is slower
+        return orjson.dumps(obj, default=_default, option=option).decode("utf-8")
+    # ensure_ascii=False keeps non-ASCII text raw, as orjson emits it
+    return json.dumps(obj, default=_default, indent=2 if indent else None, ensure_ascii=False)
+
+
+def loads(data: str | bytes) -> Any:
+    """
+    Parse JSON text or UTF-8 encoded bytes.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
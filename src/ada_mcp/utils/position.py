@@ -1,5 +1,7 @@
 """Position conversion utilities for LSP (0-based) to user (1-based) coordinates."""
 
+from typing import Any
+
 from ada_mcp.als.types import Position
 
 
@@ -17,6 +19,24 @@ def to_lsp_position(line: int, column: int) -> dict[str, int]:
     return {"line": line - 1, "character": column - 1}
 
 
+def text_document_position(file_uri: str, line: int, column: int) -> dict[str, Any]:
+    """
+    Build LSP TextDocumentPositionParams from 1-based user coordinates.
+
+    Args:
+        file_uri: Document URI
+        line: 1-based line number
+        column: 1-based column number
+
+    Returns:
+        Params dict with 'textDocument' and 0-based 'position'
+    """
+    return {
+        "textDocument": {"uri": file_uri},
+        "position": {"line": line - 1, "character": column - 1},
+    }
+
+
 def from_lsp_position(position: Position) -> tuple[int, int]:
     """
     Convert 0-based LSP position to 1-based user coordinates.
@@ -1,5 +1,7 @@
 """File URI handling utilities."""
 
+import functools
+import os
 from pathlib import Path
 from urllib.parse import unquote, urlparse
 
@@ -9,16 +11,29 @@ def file_to_uri(file_path: str | Path) -> str:
     Convert a file path to a file:// URI.
 
     Args:
-        file_path: Absolute or relative file path
+        file_path: Absolute or relative file path, or an existing file:// URI
 
     Returns:
         File URI string (e.g., "file:///home/user/project/main.adb")
     """
-    path = Path(file_path).resolve()
+    path = os.fspath(file_path)
+    if path.startswith("file://"):
+        # Already a URI: decode and re-encode through the caches rather than
+        # resolving "file:" as a relative path segment
+        path = uri_to_file(path)
+    # Resolved on every call, so a retargeted symlink is picked up; only the
+    # encoding of the resolved path is cached
+    return _resolved_path_to_uri(os.path.realpath(path))
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolved_path_to_uri(path: str) -> str:
+    """Encode a resolved absolute path as a file:// URI."""
     # Use Path.as_uri() for proper encoding
-    return path.as_uri()
+    return Path(path).as_uri()
 
 
+@functools.lru_cache(maxsize=4096)
 def uri_to_file(uri: str) -> str:
     """
     Convert a file:// URI to a file path.
@@ -29,13 +44,18 @@ def uri_to_file(uri: str) -> str:
     Returns:
         Absolute file path string
     """
-    parsed = urlparse(uri)
-
-    if parsed.scheme != "file":
-        raise ValueError(f"Expected file:// URI, got: {uri}")
-
-    # Handle URL encoding
-    path = unquote(parsed.path)
+    rest = uri[7:]
+    if uri.startswith("file:///") and "?" not in rest and "#" not in rest:
+        # Fast path for plain local URIs: no host, query or fragment to parse
+        path = unquote(rest) if "%" in rest else rest
+    else:
+        parsed = urlparse(uri)
+
+        if parsed.scheme != "file":
+            raise ValueError(f"Expected file:// URI, got: {uri}")
+
+        # Handle URL encoding
+        path = unquote(parsed.path)
 
     # On Windows, remove leading slash from /C:/path
     # (not relevant for Linux but good for portability)
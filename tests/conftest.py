@@ -1,10 +1,26 @@
 """Pytest configuration and fixtures for Ada MCP Server tests."""
 
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 from unittest.mock import AsyncMock
 
 import pytest
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+if uvloop is not None:
+
+    @pytest.fixture(scope="session")
+    def event_loop_policy() -> "uvloop.EventLoopPolicy":
+        """Run async tests on uvloop when it is installed."""
+        return uvloop.EventLoopPolicy()
+
 
 @pytest.fixture
 def fixtures_dir() -> Path:
@@ -12,13 +28,46 @@ def fixtures_dir() -> Path:
     return Path(__file__).parent / "fixtures"
 
 
+@dataclass
+class FakeALSClient:
+    """
+    ALS client stand-in exposing only the methods the tool handlers call.
+
+    Cheaper to build than AsyncMock(spec=ALSClient), which introspects the
+    whole client class; the two methods are AsyncMocks so tests can still
+    set return values and inspect calls.
+    """
+
+    send_request: AsyncMock = field(default_factory=AsyncMock)
+    send_notification: AsyncMock = field(default_factory=AsyncMock)
+
+
 @pytest.fixture
-def mock_als_client() -> AsyncMock:
-    """Create a mock ALS client for unit tests."""
-    client = AsyncMock()
-    client.send_request = AsyncMock()
-    client.send_notification = AsyncMock()
-    return client
+def mock_als_client() -> FakeALSClient:
+    """Fake ALS client for unit tests; each test gets a fresh one, so nothing is reset."""
+    return FakeALSClient()
+
+
+@dataclass
+class ScriptedALSClient:
+    """ALS client stand-in that replies from a script and records every call."""
+
+    script: deque[Any] = field(default_factory=deque)
+    calls: list[tuple[str, Any]] = field(default_factory=list)
+    notifications: list[tuple[str, Any]] = field(default_factory=list)
+
+    async def send_request(self, method: str, params: Any = None) -> Any:
+        self.calls.append((method, params))
+        return self.script.popleft()
+
+    async def send_notification(self, method: str, params: Any = None) -> None:
+        self.notifications.append((method, params))
+
+
+@pytest.fixture
+def scripted_als_client() -> ScriptedALSClient:
+    """Scripted ALS client; queue replies with client.script.extend(...)."""
+    return ScriptedALSClient()
 
 
 @pytest.fixture
@@ -35,3 +84,35 @@ begin
 end Test;
 """)
     return ada_file
+
+
+@dataclass(frozen=True)
+class AdaProject:
+    """Spec and body files of the shared read-only Ada project tree."""
+
+    root: Path
+    main_spec: Path
+    main_body: Path
+    utils_spec: Path
+    utils_body: Path
+    orphan_body: Path
+
+
+@pytest.fixture(scope="session")
+def ada_project(tmp_path_factory: pytest.TempPathFactory) -> AdaProject:
+    """Write a small Ada project once per session; tests must not modify it."""
+    root = tmp_path_factory.mktemp("ada_project")
+    project = AdaProject(
+        root=root,
+        main_spec=root / "main.ads",
+        main_body=root / "main.adb",
+        utils_spec=root / "utils.ads",
+        utils_body=root / "utils.adb",
+        orphan_body=root / "orphan.adb",
+    )
+    project.main_spec.write_text("-- Main spec\npackage Main is\nend Main;")
+    project.main_body.write_text("package body Main is\nend Main;")
+    project.utils_spec.write_text("package Utils is\n   procedure Do_Something;\nend Utils;")
+    project.utils_body.write_text("package body Utils is\nend Utils;")
+    project.orphan_body.write_text("procedure Orphan is\nbegin\n   null;\nend Orphan;")
+    return project
@@ -0,0 +1,394 @@
+"""Tests for the ALS JSON-RPC client."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from ada_mcp.als.client import ALSClient, LSPError
+from ada_mcp.als.types import DiagnosticSeverity
+
+
+@pytest.fixture
+def client():
+    """Create an ALSClient over a fake process that records written frames."""
+    process = MagicMock()
+    process.returncode = None
+    process.stdin.write = MagicMock()
+    process.stdin.drain = AsyncMock()
+    return ALSClient(process=process, debounce_seconds=0)
+
+
+def written_messages(client: ALSClient) -> list[dict]:
+    """Decode the JSON-RPC messages written to the fake stdin."""
+    messages = []
+    for call in client.process.stdin.write.call_args_list:
+        data = call.args[0]
+        while data:
+            header, _, rest = data.partition(b"\r\n\r\n")
+            length = int(header.split(b":")[1])
+            messages.append(json.loads(rest[:length]))
+            data = rest[length:]
+    return messages
+
+
+HOVER_PARAMS = {
+    "textDocument": {"uri": "file:///test/main.adb"},
+    "position": {"line": 4, "character": 3},
+}
+
+
+class TestRequestCoalescing:
+    """Tests for sharing identical in-flight requests."""
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_share_one_round_trip(self, client):
+        """Test concurrent identical hovers send a single request."""
+        first = asyncio.create_task(client.send_request("textDocument/hover", HOVER_PARAMS))
+        second = asyncio.create_task(client.send_request("textDocument/hover", HOVER_PARAMS))
+        await asyncio.sleep(0.01)
+
+        messages = written_messages(client)
+        assert len(messages) == 1
+
+        await client._handle_message({"jsonrpc": "2.0", "id": messages[0]["id"], "result": "X"})
+
+        assert await first == "X"
+        assert await second == "X"
+
+    @pytest.mark.asyncio
+    async def test_single_request_not_delayed_by_default(self, client):
+        """Test a lone hover is written without waiting for a debounce window."""
+        client = ALSClient(process=client.process)
+
+        task = asyncio.create_task(client.send_request("textDocument/hover", HOVER_PARAMS))
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        (message,) = written_messages(client)
+        assert message["method"] == "textDocument/hover"
+        await client._handle_message({"jsonrpc": "2.0", "id": message["id"], "result": "X"})
+        assert await task == "X"
+        assert client._inflight_requests == {}
+
+    @pytest.mark.asyncio
+    async def test_different_positions_not_shared(self, client):
+        """Test requests at different positions are sent separately."""
+        other = {**HOVER_PARAMS, "position": {"line": 5, "character": 3}}
+        tasks = [
+            asyncio.create_task(client.send_request("textDocument/hover", HOVER_PARAMS)),
+            asyncio.create_task(client.send_request("textDocument/hover", other)),
+        ]
+        await asyncio.sleep(0.01)
+
+        messages = written_messages(client)
+        assert len(messages) == 2
+
+        for message in messages:
+            await client._handle_message({"jsonrpc": "2.0", "id": message["id"], "result": None})
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_all_callers(self, client):
+        """Test an LSP error reaches every caller sharing the request."""
+        tasks = [
+            asyncio.create_task(client.send_request("textDocument/hover", HOVER_PARAMS))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+
+        (message,) = written_messages(client)
+        await client._handle_message(
+            {"jsonrpc": "2.0", "id": message["id"], "error": {"code": -32603, "message": "boom"}}
+        )
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(r, LSPError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_mutating_requests_not_coalesced(self, client):
+        """Test methods outside the read-only set are always sent."""
+        params = {**HOVER_PARAMS, "newName": "Other"}
+        tasks = [
+            asyncio.create_task(client.send_request("textDocument/rename", params))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+
+        messages = written_messages(client)
+        assert len(messages) == 2
+
+        for message in messages:
+            await client._handle_message({"jsonrpc": "2.0", "id": message["id"], "result": None})
+        await asyncio.gather(*tasks)
+
+
+class TestWriteBatching:
+    """Tests for batching outgoing frames into single writes."""
+
+    @pytest.mark.asyncio
+    async def test_same_tick_messages_share_one_write(self, client):
+        """Test messages queued in one loop tick are written together."""
+        await asyncio.gather(
+            client.send_notification("initialized", {}),
+            client.send_notification("textDocument/didOpen", {"textDocument": {}}),
+            client.send_notification("textDocument/didClose", {"textDocument": {}}),
+        )
+
+        assert client.process.stdin.write.call_count == 1
+        methods = [m["method"] for m in written_messages(client)]
+        assert methods == ["initialized", "textDocument/didOpen", "textDocument/didClose"]
+
+    @pytest.mark.asyncio
+    async def test_sequential_messages_written_separately(self, client):
+        """Test each awaited message is flushed before the next one is queued."""
+        await client.send_notification("initialized", {})
+        await client.send_notification("exit")
+
+        assert client.process.stdin.write.call_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    async def test_content_length_counts_bytes(self, client, use_orjson, monkeypatch):
+        """Test the header length matches the UTF-8 body with either encoder."""
+        from ada_mcp.als import client as client_module
+
+        if not use_orjson:
+            monkeypatch.setattr(client_module, "orjson", None)
+        elif client_module.orjson is None:
+            pytest.skip("orjson not installed")
+
+        await client.send_notification("window/logMessage", {"message": "Café ∑"})
+
+        data = client.process.stdin.write.call_args.args[0]
+        header, _, body = data.partition(b"\r\n\r\n")
+        assert int(header.split(b":")[1]) == len(body)
+        assert json.loads(body)["params"]["message"] == "Café ∑"
+
+
+class TestRequestDebounce:
+    """Tests for the debounce window on bursty queries."""
+
+    @pytest.mark.asyncio
+    async def test_burst_within_window_joins(self, client):
+        """Test a hover arriving during the window joins the pending request."""
+        client.debounce_seconds = 0.05
+
+        first = asyncio.create_task(client.send_request("textDocument/hover", HOVER_PARAMS))
+        await asyncio.sleep(0.01)
+        assert written_messages(client) == []
+
+        second = asyncio.create_task(client.send_request("textDocument/hover", HOVER_PARAMS))
+        await asyncio.sleep(0.08)
+
+        (message,) = written_messages(client)
+        await client._handle_message({"jsonrpc": "2.0", "id": message["id"], "result": "X"})
+
+        assert await first == "X"
+        assert await second == "X"
+
+
+def frame(message: dict) -> bytes:
+    """Encode a message with LSP Content-Length framing."""
+    body = json.dumps(message).encode("utf-8")
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+class TestReadLoop:
+    """Tests for decoding framed messages from ALS stdout."""
+
+    @pytest.mark.asyncio
+    async def test_frames_split_across_chunks(self, client):
+        """Test messages are decoded however the bytes are chunked."""
+        client.process.stdout = asyncio.StreamReader()
+        future = asyncio.get_running_loop().create_future()
+        client._pending_requests[1] = future
+        data = frame({"jsonrpc": "2.0", "id": 1, "result": {"text": "é" * 5000}})
+        data += frame({"jsonrpc": "2.0", "method": "window/logMessage", "params": {}})
+        for i in range(0, len(data), 7):
+            client.process.stdout.feed_data(data[i : i + 7])
+        client.process.stdout.feed_eof()
+
+        await client._read_loop()
+
+        assert future.result() == {"text": "é" * 5000}
+
+    @pytest.mark.asyncio
+    async def test_extra_headers_ignored(self, client):
+        """Test headers other than Content-Length are skipped."""
+        client.process.stdout = asyncio.StreamReader()
+        future = asyncio.get_running_loop().create_future()
+        client._pending_requests[7] = future
+        body = json.dumps({"jsonrpc": "2.0", "id": 7, "result": 3}).encode("utf-8")
+        client.process.stdout.feed_data(
+            b"Content-Type: application/vscode-jsonrpc; charset=utf-8\r\n"
+            b"Content-Length: %d\r\n\r\n" % len(body) + body
+        )
+        client.process.stdout.feed_eof()
+
+        await client._read_loop()
+
+        assert future.result() == 3
+
+    @pytest.mark.asyncio
+    async def test_truncated_body_stops_loop(self, client):
+        """Test a body cut short by EOF ends the loop without dispatching."""
+        client.process.stdout = asyncio.StreamReader()
+        client._handle_message = AsyncMock()
+        client.process.stdout.feed_data(b"Content-Length: 100\r\n\r\n{}")
+        client.process.stdout.feed_eof()
+
+        await client._read_loop()
+
+        client._handle_message.assert_not_called()
+
+
+class TestAbandonedRequests:
+    """Tests for replies to requests the caller no longer waits for."""
+
+    @pytest.mark.asyncio
+    async def test_rejected_rename_reply_keeps_read_loop_alive(self, client):
+        """Test a late reply to a cancelled rename is dropped and reading continues."""
+        from ada_mcp.tools.refactoring import handle_rename_symbol
+
+        client.process.stdout = asyncio.StreamReader()
+        client.start_reading()
+        rename = asyncio.create_task(
+            handle_rename_symbol(client, "/test/main.adb", 5, 11, "New_Name")
+        )
+        await asyncio.sleep(0.01)
+
+        prepare, rename_request = written_messages(client)
+        assert rename_request["method"] == "textDocument/rename"
+        client.process.stdout.feed_data(
+            frame({"jsonrpc": "2.0", "id": prepare["id"], "result": None})
+        )
+        result = await rename
+        assert result["error"] == "Cannot rename symbol at this location"
+        assert client._pending_requests == {}
+
+        # ALS still answers the abandoned rename
+        client.process.stdout.feed_data(
+            frame({"jsonrpc": "2.0", "id": rename_request["id"], "result": {"changes": {}}})
+        )
+        hover = asyncio.create_task(client.send_request("textDocument/hover", HOVER_PARAMS))
+        await asyncio.sleep(0.01)
+        message = written_messages(client)[-1]
+        client.process.stdout.feed_data(
+            frame({"jsonrpc": "2.0", "id": message["id"], "result": "X"})
+        )
+
+        assert await asyncio.wait_for(hover, timeout=1) == "X"
+        assert not client._read_task.done()
+        client._read_task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_rejected_rename_is_cancelled_in_als(self, client):
+        """Test discarding the rename after a failed prepareRename cancels it in ALS."""
+        from ada_mcp.tools.refactoring import handle_rename_symbol
+
+        rename = asyncio.create_task(
+            handle_rename_symbol(client, "/test/main.adb", 5, 11, "New_Name")
+        )
+        await asyncio.sleep(0.01)
+
+        prepare, rename_request = written_messages(client)
+        await client._handle_message({"jsonrpc": "2.0", "id": prepare["id"], "result": None})
+        await rename
+        await asyncio.sleep(0)
+
+        assert written_messages(client)[2:] == [
+            {"jsonrpc": "2.0", "method": "$/cancelRequest", "params": {"id": rename_request["id"]}}
+        ]
+
+
+def publish_params(uri: str, *severities: int) -> dict:
+    """Build publishDiagnostics params with one diagnostic per severity."""
+    return {
+        "uri": uri,
+        "diagnostics": [
+            {
+                "range": {
+                    "start": {"line": i, "character": 0},
+                    "end": {"line": i, "character": 1},
+                },
+                "severity": severity,
+                "message": f"diagnostic {i}",
+            }
+            for i, severity in enumerate(severities)
+        ],
+    }
+
+
+class TestDiagnosticIndex:
+    """Tests for the per-severity diagnostics index."""
+
+    @pytest.mark.asyncio
+    async def test_publish_updates_index(self, client):
+        """Test published diagnostics are bucketed by severity."""
+        await client._handle_diagnostics(publish_params("file:///a.adb", 1, 2, 2))
+        await client._handle_diagnostics(publish_params("file:///b.adb", 1))
+
+        store = client._diagnostics
+        assert store.counts[DiagnosticSeverity.ERROR] == 2
+        assert store.counts[DiagnosticSeverity.WARNING] == 2
+        assert set(store.by_severity[DiagnosticSeverity.ERROR]) == {
+            "file:///a.adb",
+            "file:///b.adb",
+        }
+
+    @pytest.mark.asyncio
+    async def test_republish_replaces_uri_entries(self, client):
+        """Test a new publish for a URI drops its previous index entries."""
+        await client._handle_diagnostics(publish_params("file:///a.adb", 1, 2))
+        await client._handle_diagnostics(publish_params("file:///a.adb", 2))
+
+        store = client._diagnostics
+        assert store.counts[DiagnosticSeverity.ERROR] == 0
+        assert store.counts[DiagnosticSeverity.WARNING] == 1
+        assert "file:///a.adb" not in store.by_severity[DiagnosticSeverity.ERROR]
+
+    @pytest.mark.asyncio
+    async def test_stored_diagnostics_use_slots(self, client):
+        """Test stored diagnostic records carry no per-instance __dict__."""
+        await client._handle_diagnostics(publish_params("file:///a.adb", 1))
+
+        diag = client._diagnostics["file:///a.adb"][0]
+        assert not hasattr(diag, "__dict__")
+        assert not hasattr(diag.range, "__dict__")
+        assert not hasattr(diag.range.start, "__dict__")
+
+    def test_compact_range_matches_positions(self):
+        """Test a parsed range equals one built from Positions and round-trips."""
+        from ada_mcp.als.types import Position, Range
+
+        data = {"start": {"line": 4, "character": 10}, "end": {"line": 5, "character": 2}}
+        parsed = Range.from_dict(data)
+
+        assert parsed == Range(Position(4, 10), Position(5, 2))
+        assert (parsed.start, parsed.end) == (Position(4, 10), Position(5, 2))
+        assert parsed.to_dict() == data
+
+    def test_range_positions_are_fields(self):
+        """Test ranges support dataclasses.replace and in-place position edits."""
+        import dataclasses
+
+        from ada_mcp.als.types import Position, Range
+
+        span = Range(Position(4, 10), Position(5, 2))
+        assert dataclasses.replace(span, end=Position(6, 0)).end == Position(6, 0)
+
+        span.start.line = 7
+        assert span.to_dict()["start"] == {"line": 7, "character": 10}
+
+    @pytest.mark.asyncio
+    async def test_get_diagnostics_by_severity(self, client):
+        """Test severity queries are answered from the index."""
+        await client._handle_diagnostics(publish_params("file:///a.adb", 1, 2))
+        await client._handle_diagnostics(publish_params("file:///b.adb", 2))
+
+        errors = await client.get_diagnostics(severity=DiagnosticSeverity.ERROR)
+
+        assert [len(d) for d in errors.values()] == [1, 0]
+        assert errors["file:///a.adb"][0].severity == DiagnosticSeverity.ERROR
@@ -193,6 +193,34 @@ class TestALSPool:
             # Shutdown should have been called for eviction
             assert mock_shutdown.called
 
+    @pytest.mark.asyncio
+    async def test_concurrent_starts_respect_limit(self):
+        """Test instances still starting count against max_instances."""
+        pool = ALSPool(max_instances=2)
+
+        async def mock_start(*args, **kwargs):
+            client = MagicMock()
+            client.is_running = True
+            return (client, MagicMock())
+
+        with (
+            patch("ada_mcp.server.start_als_with_monitoring", side_effect=mock_start),
+            patch(
+                "ada_mcp.server.find_project_root",
+                side_effect=lambda p: Path(str(p).rsplit("/src", 1)[0]),
+            ),
+            patch("ada_mcp.server.shutdown_als", new_callable=AsyncMock),
+        ):
+            await pool.get_client("/project1/src/main.adb")
+
+            # Two more projects start side by side while project1 is ready
+            await asyncio.gather(
+                pool.get_client("/project2/src/main.adb"),
+                pool.get_client("/project3/src/main.adb"),
+            )
+
+            assert set(pool._instances) == {Path("/project2"), Path("/project3")}
+
     @pytest.mark.asyncio
     async def test_shutdown_all(self):
         """Test shutting down all instances."""
@@ -266,3 +294,53 @@ class TestALSPool:
             client2 = await pool.get_client("/test/project/src/main.adb")
             assert client2 is mock_client2
             assert call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_get_client_starts_once(self):
+        """Test concurrent callers for one project share a single ALS start."""
+        pool = ALSPool()
+
+        mock_client = MagicMock()
+        mock_client.is_running = True
+
+        with (
+            patch(
+                "ada_mcp.server.start_als_with_monitoring",
+                new_callable=AsyncMock,
+                return_value=(mock_client, MagicMock()),
+            ) as mock_start,
+            patch(
+                "ada_mcp.server.find_project_root",
+                return_value=Path("/test/project"),
+            ),
+        ):
+            clients = await asyncio.gather(
+                pool.get_client("/test/project/src/main.adb"),
+                pool.get_client("/test/project/src/utils.ads"),
+            )
+
+            assert clients == [mock_client, mock_client]
+            assert mock_start.call_count == 1
+            assert pool._starting == {}
+
+    @pytest.mark.asyncio
+    async def test_prewarm_registers_instance(self):
+        """Test prewarming starts the ALS so the next call reuses it."""
+        pool = ALSPool()
+
+        mock_client = MagicMock()
+        mock_client.is_running = True
+
+        with (
+            patch(
+                "ada_mcp.server.start_als_with_monitoring",
+                new_callable=AsyncMock,
+                return_value=(mock_client, MagicMock()),
+            ) as mock_start,
+            patch.dict("os.environ", {"ADA_PROJECT_ROOT": "/test/project"}),
+        ):
+            await pool.prewarm()
+
+            assert Path("/test/project") in pool._instances
+            assert await pool.get_client() is mock_client
+            assert mock_start.call_count == 1
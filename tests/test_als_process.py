@@ -96,12 +96,7 @@ class TestALSHealthMonitor:
     @pytest.mark.asyncio
     async def test_max_backoff_capped(self, monitor):
         """Test that backoff is capped at max_backoff_seconds."""
-        monitor.restart_count = 100  # High count to exceed max
-        backoff = min(
-            monitor.initial_backoff_seconds * (monitor.backoff_multiplier**monitor.restart_count),
-            monitor.max_backoff_seconds,
-        )
-        assert backoff == monitor.max_backoff_seconds
+        assert monitor._backoff_seconds(100) == monitor.max_backoff_seconds
 
     @pytest.mark.asyncio
     async def test_monitor_detects_crash(self, monitor, mock_client):
@@ -146,19 +141,28 @@ class TestALSHealthMonitorBackoff:
             client=MagicMock(),
             project_root=Path("/test"),
             als_path="/test/als",
+            max_restart_attempts=8,
             initial_backoff_seconds=1.0,
             max_backoff_seconds=60.0,
             backoff_multiplier=2.0,
         )
 
-        # Test backoff sequence
-        expected_sequence = [1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 60.0, 60.0]
-        for attempt, expected in enumerate(expected_sequence):
-            actual = min(
-                monitor.initial_backoff_seconds * (monitor.backoff_multiplier**attempt),
-                monitor.max_backoff_seconds,
-            )
-            assert actual == expected, f"Attempt {attempt}: expected {expected}, got {actual}"
+        assert monitor._backoff_table == (1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 60.0, 60.0)
+
+    def test_backoff_values_fractional_multiplier(self):
+        """Test backoff with a non-integer multiplier."""
+        monitor = ALSHealthMonitor(
+            client=MagicMock(),
+            project_root=Path("/test"),
+            als_path="/test/als",
+            max_restart_attempts=4,
+            initial_backoff_seconds=2.0,
+            max_backoff_seconds=5.0,
+            backoff_multiplier=1.5,
+        )
+
+        assert monitor._backoff_table == (2.0, 3.0, 4.5, 5.0)
+        assert monitor._backoff_seconds(10) == 5.0
 
 
 class TestHealthMonitorIntegration:
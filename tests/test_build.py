@@ -150,6 +150,23 @@ class TestBuild:
         assert result["error_count"] == 1
         assert result["errors"][0]["line"] == 10
 
+    @pytest.mark.asyncio
+    async def test_repeated_builds_each_run_gprbuild(self, tmp_path):
+        """Test back-to-back builds are not served from a cache; sources may have changed."""
+        gpr_file = tmp_path / "test.gpr"
+        gpr_file.write_text("project Test is\nend Test;")
+
+        with patch("asyncio.create_subprocess_exec") as mock_exec:
+            mock_proc = AsyncMock()
+            mock_proc.returncode = 0
+            mock_proc.communicate = AsyncMock(return_value=(b"", b""))
+            mock_exec.return_value = mock_proc
+
+            await handle_build(gpr_file=str(gpr_file))
+            await handle_build(gpr_file=str(gpr_file))
+
+        assert mock_exec.call_count == 2
+
     @pytest.mark.asyncio
     async def test_build_gprbuild_not_found(self, tmp_path):
         """Test build when gprbuild is not in PATH."""
@@ -12,7 +12,9 @@ from ada_mcp.utils.cache import (
     cached,
     cached_with_file_invalidation,
     clear_all_caches,
+    definition_cache,
     get_cache_stats,
+    hover_cache,
     invalidate_file_caches,
     make_cache_key,
 )
@@ -37,6 +39,11 @@ class TestCacheEntry:
         time.sleep(0.1)
         assert entry.age_seconds >= 0.1
 
+    def test_uses_slots(self):
+        """Test entries carry no per-instance __dict__."""
+        entry = CacheEntry(value="test", expires_at=time.monotonic() + 10)
+        assert not hasattr(entry, "__dict__")
+
 
 class TestCacheStats:
     """Tests for CacheStats class."""
@@ -88,6 +95,21 @@ class TestTTLCache:
         result = await cache.get("nonexistent")
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_get_sync(self):
+        """Test synchronous lookup of live and expired entries."""
+        cache = TTLCache[str](ttl_seconds=0.05)
+        await cache.set("key", "value")
+
+        assert cache.get_sync("key") == "value"
+        assert cache.get_sync("nonexistent") is None
+
+        await asyncio.sleep(0.1)
+
+        assert cache.get_sync("key") is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 2
+
     @pytest.mark.asyncio
     async def test_expiration(self):
         """Test that entries expire after TTL."""
@@ -140,6 +162,37 @@ class TestTTLCache:
         assert await cache.get("file:/project/src/main.adb:def:xyz") is None
         assert await cache.get("file:/project/src/other.adb:hover:123") == "other_data"
 
+    @pytest.mark.asyncio
+    async def test_invalidate_file_exact_path(self, cache):
+        """Test that invalidating a file leaves paths sharing its prefix alone."""
+        await cache.set("file:/project/src/main.adb:hover:abc", "hover_data")
+        await cache.set("file:/project/src/main.adb.bak:hover:abc", "backup_data")
+
+        await cache.invalidate_file("/project/src/main.adb")
+
+        assert await cache.get("file:/project/src/main.adb:hover:abc") is None
+        assert await cache.get("file:/project/src/main.adb.bak:hover:abc") == "backup_data"
+        assert cache.stats.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_file_path_with_colon(self, cache):
+        """Test invalidating a file whose path contains a drive-letter colon."""
+        await cache.set(
+            "file:C:/project/main.adb:hover:abc", "hover_data", file="C:/project/main.adb"
+        )
+        await cache.set("file:C:/project/main.adb:def:abc", "def_data")
+        await cache.set(
+            "file:C:/project/other.adb:hover:abc", "other_data", file="C:/project/other.adb"
+        )
+        await cache.set("file:C:/project/other.adb:def:abc", "other_def")
+
+        await cache.invalidate_file("C:/project/main.adb")
+
+        assert await cache.get("file:C:/project/main.adb:hover:abc") is None
+        assert await cache.get("file:C:/project/main.adb:def:abc") is None
+        assert await cache.get("file:C:/project/other.adb:hover:abc") == "other_data"
+        assert await cache.get("file:C:/project/other.adb:def:abc") == "other_def"
+
     @pytest.mark.asyncio
     async def test_clear(self, cache):
         """Test clearing all entries."""
@@ -214,6 +267,43 @@ class TestTTLCache:
         assert result2 == "computed_value"
         assert factory_calls == 1  # Only called once
 
+    @pytest.mark.asyncio
+    async def test_get_or_set_concurrent_misses(self, cache):
+        """Test concurrent misses on one key share a single factory call."""
+        factory_calls = 0
+
+        async def factory():
+            nonlocal factory_calls
+            factory_calls += 1
+            await asyncio.sleep(0.01)
+            return "computed_value"
+
+        results = await asyncio.gather(*(cache.get_or_set("key", factory) for _ in range(5)))
+
+        assert results == ["computed_value"] * 5
+        assert factory_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_retries_after_failure(self, cache):
+        """Test waiters compute the value themselves if the first factory fails."""
+        started = asyncio.Event()
+
+        async def failing_factory():
+            started.set()
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        async def factory():
+            return "recovered"
+
+        first = asyncio.create_task(cache.get_or_set("key", failing_factory))
+        await started.wait()
+        second = await cache.get_or_set("key", factory)
+
+        with pytest.raises(RuntimeError):
+            await first
+        assert second == "recovered"
+
     @pytest.mark.asyncio
     async def test_max_entries_eviction(self):
         """Test that old entries are evicted when max_entries is reached."""
@@ -224,12 +314,60 @@ class TestTTLCache:
         await cache.set("key3", "value3")
 
         # Adding 4th entry should trigger eviction of expired entries
-        # Since none are expired, all should remain
+        # Since none are expired, the least recently used one goes
         await cache.set("key4", "value4")
 
-        # At least the new entry should be there
+        assert cache.size == 3
+        assert await cache.get("key1") is None
         assert await cache.get("key4") == "value4"
 
+    @pytest.mark.asyncio
+    async def test_max_entries_evicts_least_recently_used(self):
+        """Test that a read keeps an entry from being evicted."""
+        cache = TTLCache[str](ttl_seconds=100.0, max_entries=2)
+
+        await cache.set("key1", "value1")
+        await cache.set("key2", "value2")
+        await cache.get("key1")
+        await cache.set("key3", "value3")
+
+        assert await cache.get("key1") == "value1"
+        assert await cache.get("key2") is None
+        assert await cache.get("key3") == "value3"
+
+    @pytest.mark.asyncio
+    async def test_bytes_tracking(self):
+        """Test that the byte total follows sets, overwrites and invalidations."""
+        cache = TTLCache[str](ttl_seconds=100.0, sizer=len)
+
+        await cache.set("key1", "abcd")
+        await cache.set("key2", "ef")
+        assert cache.bytes == 6
+
+        await cache.set("key1", "a")
+        assert cache.bytes == 3
+
+        await cache.invalidate("key2")
+        assert cache.bytes == 1
+
+        await cache.clear()
+        assert cache.bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_max_bytes_eviction(self):
+        """Test that oldest entries are evicted when the byte budget is exceeded."""
+        cache = TTLCache[str](ttl_seconds=100.0, max_bytes=10, sizer=len)
+
+        await cache.set("key1", "aaaa")
+        await cache.set("key2", "bbbb")
+        await cache.set("key3", "cccc")
+
+        assert await cache.get("key1") is None
+        assert await cache.get("key2") == "bbbb"
+        assert await cache.get("key3") == "cccc"
+        assert cache.bytes == 8
+        assert cache.stats.evictions == 1
+
 
 class TestCacheKey:
     """Tests for cache key generation."""
@@ -334,6 +472,7 @@ class TestGlobalCacheFunctions:
 
         for cache_stats in stats.values():
             assert "size" in cache_stats
+            assert "bytes" in cache_stats
             assert "hits" in cache_stats
             assert "misses" in cache_stats
             assert "hit_rate" in cache_stats
@@ -347,5 +486,15 @@ class TestGlobalCacheFunctions:
     @pytest.mark.asyncio
     async def test_invalidate_file_caches(self):
         """Test invalidating all caches for a file."""
-        # This should not raise any errors
+        await hover_cache.set("file:/test/file.adb:hover:abc", "hover_data")
+        await definition_cache.set("file:/test/file.adb:def:abc", "def_data")
+        await definition_cache.set("file:/test/other.adb:def:abc", "other_data")
+
         await invalidate_file_caches("/test/file.adb")
+
+        assert hover_cache.get_sync("file:/test/file.adb:hover:abc") is None
+        assert definition_cache.get_sync("file:/test/file.adb:def:abc") is None
+        assert definition_cache.get_sync("file:/test/other.adb:def:abc") == "other_data"
+
+        await clear_all_caches()
+        assert definition_cache.size == 0
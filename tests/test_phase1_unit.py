@@ -17,6 +17,8 @@ import json
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 
+from ada_mcp.als.client import DiagnosticStore
+
 
 # ============================================================================
 # Fixtures
@@ -25,12 +27,10 @@ from unittest.mock import AsyncMock, patch, MagicMock
 @pytest.fixture
 def mock_als_client():
     """Create a mock ALS client for unit testing."""
-    import asyncio
     client = AsyncMock()
     client.send_request = AsyncMock()
     # Properties used by diagnostics handler
-    client._diagnostics = {}
-    client._diagnostics_lock = asyncio.Lock()
+    client._diagnostics = DiagnosticStore()
     return client
 
 
@@ -160,6 +160,8 @@ class TestGotoDefinition:
         # Should not crash, either return not found or handle gracefully
         data = json.loads(result[0].text)
         assert "found" in data or "error" in data
+        # Rejected before any ALS round-trip
+        mock_get_als.send_request.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_definition_als_error(self, mock_get_als):
@@ -177,6 +179,72 @@ class TestGotoDefinition:
         # Error responses contain "error" key
         assert "error" in data
 
+    @pytest.mark.asyncio
+    async def test_definition_cached_until_file_changes(self, mock_get_als, sample_ada_file):
+        """Test repeated lookups reuse the result until the file is modified."""
+        import os
+
+        mock_get_als.send_request.return_value = [{
+            "uri": "file:///project/src/utils.ads",
+            "range": {"start": {"line": 4, "character": 3}, "end": {"line": 4, "character": 6}}
+        }]
+        args = {"file": str(sample_ada_file), "line": 4, "column": 4}
+
+        from ada_mcp.server import call_tool
+        first = await call_tool("ada_goto_definition", args)
+        second = await call_tool("ada_goto_definition", args)
+
+        assert mock_get_als.send_request.call_count == 1
+        assert json.loads(second[0].text) == json.loads(first[0].text)
+
+        # Bump the modification time to simulate an edit
+        stat = sample_ada_file.stat()
+        os.utime(sample_ada_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        await call_tool("ada_goto_definition", args)
+
+        assert mock_get_als.send_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_definition_cache_checks_target_file(self, mock_get_als, tmp_path):
+        """Test editing the file a definition points into drops the cached hit."""
+        import os
+
+        main = tmp_path / "main.adb"
+        main.write_text("with Utils;\nprocedure Main is begin Utils.Run; end Main;\n")
+        spec = tmp_path / "utils.ads"
+        spec.write_text("package Utils is\n   procedure Run;\nend Utils;\n")
+        mock_get_als.send_request.return_value = [{
+            "uri": spec.as_uri(),
+            "range": {"start": {"line": 1, "character": 13}, "end": {"line": 1, "character": 16}}
+        }]
+        args = {"file": str(main), "line": 2, "column": 30}
+
+        from ada_mcp.server import call_tool
+        await call_tool("ada_goto_definition", args)
+        await call_tool("ada_goto_definition", args)
+        assert mock_get_als.send_request.call_count == 1
+
+        stat = spec.stat()
+        os.utime(spec, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        await call_tool("ada_goto_definition", args)
+
+        assert mock_get_als.send_request.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_definition_builds_uri_once(self, mock_get_als, sample_ada_file):
+        """Test the file URI is built once and shared with the didOpen."""
+        from ada_mcp.tools import navigation
+
+        navigation.clear_open_files_cache()
+        mock_get_als.send_request.return_value = None
+
+        with patch.object(navigation, "file_to_uri", wraps=navigation.file_to_uri) as to_uri:
+            await navigation.handle_goto_definition(mock_get_als, str(sample_ada_file), 1, 1)
+
+        assert to_uri.call_count == 1
+        opened = mock_get_als.send_notification.call_args[0][1]["textDocument"]["uri"]
+        assert opened == sample_ada_file.resolve().as_uri()
+
 
 # ============================================================================
 # ada_hover Tests
@@ -290,6 +358,110 @@ class TestHover:
         data = json.loads(result[0].text)
         assert data["found"] is False
 
+    @pytest.mark.asyncio
+    async def test_hover_cached_until_content_changes(self, mock_get_als, sample_ada_file):
+        """Test repeated hovers reuse the result until the file content changes."""
+        mock_get_als.send_request.return_value = {
+            "contents": {"kind": "plaintext", "value": "X : Integer"}
+        }
+        args = {"file": str(sample_ada_file), "line": 4, "column": 4}
+
+        def hover_calls():
+            return [c for c in mock_get_als.send_request.call_args_list
+                    if c.args[0] == "textDocument/hover"]
+
+        from ada_mcp.server import call_tool
+        await call_tool("ada_hover", args)
+        result = await call_tool("ada_hover", args)
+
+        assert len(hover_calls()) == 1
+        assert json.loads(result[0].text)["contents"] == "X : Integer"
+
+        sample_ada_file.write_text(sample_ada_file.read_text().replace("42", "43"))
+        await call_tool("ada_hover", args)
+
+        assert len(hover_calls()) == 2
+
+    @pytest.mark.asyncio
+    async def test_hover_cache_checks_declaring_file(self, mock_get_als, tmp_path):
+        """Test editing the unit that declares the hovered symbol drops the cached hit."""
+        import os
+
+        main = tmp_path / "main.adb"
+        main.write_text("with Utils;\nprocedure Main is begin Utils.Run; end Main;\n")
+        spec = tmp_path / "utils.ads"
+        spec.write_text("package Utils is\n   procedure Run;\nend Utils;\n")
+
+        async def send_request(method, params=None):
+            if method == "textDocument/definition":
+                return [{"uri": spec.as_uri(), "range": {"start": {"line": 1, "character": 13}}}]
+            return {"contents": "procedure Run"}
+
+        mock_get_als.send_request.side_effect = send_request
+        args = {"file": str(main), "line": 2, "column": 30}
+
+        def methods():
+            return [c.args[0] for c in mock_get_als.send_request.call_args_list]
+
+        from ada_mcp.server import call_tool
+        await call_tool("ada_goto_definition", args)
+        await call_tool("ada_hover", args)
+        await call_tool("ada_hover", args)
+        assert methods() == ["textDocument/definition", "textDocument/hover"]
+
+        stat = spec.stat()
+        os.utime(spec, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        await call_tool("ada_hover", args)
+
+        assert methods().count("textDocument/hover") == 2
+
+    @pytest.mark.asyncio
+    async def test_hover_miss_sends_only_hover(self, mock_get_als, sample_ada_file):
+        """Test a cold hover costs a single ALS round-trip."""
+        mock_get_als.send_request.return_value = None
+        args = {"file": str(sample_ada_file), "line": 4, "column": 5}
+
+        from ada_mcp.server import call_tool
+        await call_tool("ada_hover", args)
+
+        methods = [c.args[0] for c in mock_get_als.send_request.call_args_list]
+        assert methods == ["textDocument/hover"]
+
+    @pytest.mark.asyncio
+    async def test_content_hash_reused_until_stamp_changes(self, sample_ada_file):
+        """Test settled files are hashed once per (mtime, size) stamp."""
+        import hashlib
+        import os
+
+        from ada_mcp.tools import navigation
+
+        navigation.clear_open_files_cache()
+        os.utime(sample_ada_file, ns=(1_000_000_000, 1_000_000_000))
+        with patch.object(navigation.hashlib, "blake2b", wraps=hashlib.blake2b) as blake:
+            first = await navigation._content_hash(str(sample_ada_file))
+            assert await navigation._content_hash(str(sample_ada_file)) == first
+            assert blake.call_count == 1
+
+            # Recently modified files are always re-read
+            sample_ada_file.write_text(sample_ada_file.read_text() + "\n")
+            await navigation._content_hash(str(sample_ada_file))
+            await navigation._content_hash(str(sample_ada_file))
+            assert blake.call_count == 3
+
+    @pytest.mark.parametrize("contents,expected", [
+        ("plain", "plain"),
+        ({"kind": "markdown", "value": "**md**"}, "**md**"),
+        ({"language": "ada", "value": "X : Integer"}, "X : Integer"),
+        (["a", {"language": "ada", "value": "b"}, 3], "a\nb"),
+        ({"kind": "plaintext"}, "{'kind': 'plaintext'}"),
+        (None, "None"),
+    ])
+    def test_hover_text_shapes(self, contents, expected):
+        """Test every hover contents shape flattens to the expected text."""
+        from ada_mcp.tools.navigation import _hover_text
+
+        assert _hover_text(contents) == expected
+
 
 # ============================================================================
 # ada_diagnostics Tests
@@ -302,7 +474,7 @@ class TestDiagnostics:
     async def test_diagnostics_all_files(self, mock_get_als):
         """Test getting diagnostics for all files."""
         from ada_mcp.als.types import Diagnostic, Range, Position, DiagnosticSeverity
-        mock_get_als._diagnostics = {
+        mock_get_als._diagnostics = DiagnosticStore({
             "file:///project/src/main.adb": [
                 Diagnostic(
                     range=Range(Position(4, 10), Position(4, 15)),
@@ -311,7 +483,7 @@ class TestDiagnostics:
                     code="type-error"
                 )
             ]
-        }
+        })
 
         from ada_mcp.server import call_tool
         result = await call_tool("ada_diagnostics", {
@@ -326,7 +498,7 @@ class TestDiagnostics:
     async def test_diagnostics_single_file(self, mock_get_als):
         """Test getting diagnostics for specific file."""
         from ada_mcp.als.types import Diagnostic, Range, Position, DiagnosticSeverity
-        mock_get_als._diagnostics = {
+        mock_get_als._diagnostics = DiagnosticStore({
             "file:///project/src/main.adb": [
                 Diagnostic(
                     range=Range(Position(4, 10), Position(4, 15)),
@@ -341,7 +513,7 @@ class TestDiagnostics:
                     message="warning in utils.ads"
                 )
             ]
-        }
+        })
 
         from ada_mcp.server import call_tool
         result = await call_tool("ada_diagnostics", {
@@ -358,13 +530,19 @@ class TestDiagnostics:
     async def test_diagnostics_filter_errors_only(self, mock_get_als):
         """Test filtering for errors only."""
         from ada_mcp.als.types import Diagnostic, Range, Position, DiagnosticSeverity
-        mock_get_als._diagnostics = {
+        mock_get_als._diagnostics = DiagnosticStore({
             "file:///project/src/main.adb": [
-                Diagnostic(Range(Position(4, 0), Position(4, 5)), DiagnosticSeverity.ERROR, "error"),
-                Diagnostic(Range(Position(5, 0), Position(5, 5)), DiagnosticSeverity.WARNING, "warning"),
-                Diagnostic(Range(Position(6, 0), Position(6, 5)), DiagnosticSeverity.INFORMATION, "info"),
+                Diagnostic(
+                    Range(Position(4, 0), Position(4, 5)), "error", DiagnosticSeverity.ERROR
+                ),
+                Diagnostic(
+                    Range(Position(5, 0), Position(5, 5)), "warning", DiagnosticSeverity.WARNING
+                ),
+                Diagnostic(
+                    Range(Position(6, 0), Position(6, 5)), "info", DiagnosticSeverity.INFORMATION
+                ),
             ]
-        }
+        })
 
         from ada_mcp.server import call_tool
         result = await call_tool("ada_diagnostics", {
@@ -379,12 +557,16 @@ class TestDiagnostics:
     async def test_diagnostics_filter_warnings_only(self, mock_get_als):
         """Test filtering for warnings only."""
         from ada_mcp.als.types import Diagnostic, Range, Position, DiagnosticSeverity
-        mock_get_als._diagnostics = {
+        mock_get_als._diagnostics = DiagnosticStore({
             "file:///project/src/main.adb": [
-                Diagnostic(Range(Position(4, 0), Position(4, 5)), DiagnosticSeverity.ERROR, "error"),
-                Diagnostic(Range(Position(5, 0), Position(5, 5)), DiagnosticSeverity.WARNING, "warning"),
+                Diagnostic(
+                    Range(Position(4, 0), Position(4, 5)), "error", DiagnosticSeverity.ERROR
+                ),
+                Diagnostic(
+                    Range(Position(5, 0), Position(5, 5)), "warning", DiagnosticSeverity.WARNING
+                ),
             ]
-        }
+        })
 
         from ada_mcp.server import call_tool
         result = await call_tool("ada_diagnostics", {
@@ -398,7 +580,7 @@ class TestDiagnostics:
     @pytest.mark.asyncio
     async def test_diagnostics_no_errors(self, mock_get_als):
         """Test when project has no diagnostics."""
-        mock_get_als._diagnostics = {}
+        mock_get_als._diagnostics = DiagnosticStore({})
 
         from ada_mcp.server import call_tool
         result = await call_tool("ada_diagnostics", {
@@ -414,7 +596,7 @@ class TestDiagnostics:
     async def test_diagnostics_line_number_conversion(self, mock_get_als):
         """Test that line numbers are converted from 0-based to 1-based."""
         from ada_mcp.als.types import Diagnostic, Range, Position, DiagnosticSeverity
-        mock_get_als._diagnostics = {
+        mock_get_als._diagnostics = DiagnosticStore({
             "file:///project/src/main.adb": [
                 Diagnostic(
                     range=Range(Position(9, 4), Position(9, 10)),  # 0-based line 9
@@ -422,7 +604,7 @@ class TestDiagnostics:
                     message="test error"
                 )
             ]
-        }
+        })
 
         from ada_mcp.server import call_tool
         result = await call_tool("ada_diagnostics", {
@@ -434,6 +616,185 @@ class TestDiagnostics:
             # Should be 1-based for user (line 10)
             assert data["diagnostics"][0]["line"] == 10
 
+    @pytest.mark.asyncio
+    async def test_diagnostics_hint_filter_counts(self, mock_get_als):
+        """Test the hint filter includes info diagnostics and counts them as hints."""
+        from ada_mcp.als.types import Diagnostic, DiagnosticSeverity, Position, Range
+        span = Range(Position(0, 0), Position(0, 1))
+        mock_get_als._diagnostics = DiagnosticStore({
+            "file:///project/src/main.adb": [
+                Diagnostic(span, "error", DiagnosticSeverity.ERROR),
+                Diagnostic(span, "info", DiagnosticSeverity.INFORMATION),
+                Diagnostic(span, "hint", DiagnosticSeverity.HINT),
+            ]
+        })
+
+        from ada_mcp.server import call_tool
+        result = await call_tool("ada_diagnostics", {"severity": "hint"})
+
+        data = json.loads(result[0].text)
+        # Published order within the file, not grouped by severity
+        assert [d["severity"] for d in data["diagnostics"]] == ["info", "hint"]
+        assert (data["errorCount"], data["warningCount"], data["hintCount"]) == (0, 0, 2)
+
+    @pytest.mark.asyncio
+    async def test_diagnostics_filter_keeps_file_order(self, mock_get_als):
+        """Test filtered results follow the store's file order after a republish."""
+        from ada_mcp.als.types import Diagnostic, DiagnosticSeverity, Position, Range
+        span = Range(Position(0, 0), Position(0, 1))
+        store = DiagnosticStore({
+            "file:///project/src/a.adb": [Diagnostic(span, "a", DiagnosticSeverity.ERROR)],
+            "file:///project/src/b.adb": [Diagnostic(span, "b", DiagnosticSeverity.ERROR)],
+        })
+        store["file:///project/src/a.adb"] = [Diagnostic(span, "a2", DiagnosticSeverity.ERROR)]
+        mock_get_als._diagnostics = store
+
+        from ada_mcp.server import call_tool
+        result = await call_tool("ada_diagnostics", {"severity": "error"})
+
+        data = json.loads(result[0].text)
+        assert [d["message"] for d in data["diagnostics"]] == ["a2", "b"]
+
+    @pytest.mark.asyncio
+    async def test_diagnostics_all_counts_per_file(self, mock_get_als):
+        """Test unfiltered counts only include the requested file's buckets."""
+        from ada_mcp.als.types import Diagnostic, DiagnosticSeverity, Position, Range
+        span = Range(Position(0, 0), Position(0, 1))
+        mock_get_als._diagnostics = DiagnosticStore({
+            "file:///project/src/main.adb": [
+                Diagnostic(span, "error", DiagnosticSeverity.ERROR),
+                Diagnostic(span, "warning", DiagnosticSeverity.WARNING),
+                Diagnostic(span, "info", DiagnosticSeverity.INFORMATION),
+            ],
+            "file:///project/src/utils.ads": [
+                Diagnostic(span, "error", DiagnosticSeverity.ERROR),
+            ],
+        })
+
+        from ada_mcp.server import call_tool
+        everything = json.loads((await call_tool("ada_diagnostics", {}))[0].text)
+        main_only = json.loads((await call_tool(
+            "ada_diagnostics", {"file": "/project/src/main.adb"}
+        ))[0].text)
+
+        assert (everything["errorCount"], everything["warningCount"]) == (2, 1)
+        assert everything["hintCount"] == 1
+        assert (main_only["errorCount"], main_only["warningCount"]) == (1, 1)
+        assert main_only["hintCount"] == 1
+
+    @pytest.mark.asyncio
+    async def test_diagnostics_pagination(self, mock_get_als):
+        """Test offset/limit return one page while counts cover all matches."""
+        from ada_mcp.als.types import Diagnostic, DiagnosticSeverity, Position, Range
+        mock_get_als._diagnostics = DiagnosticStore({
+            "file:///project/src/main.adb": [
+                Diagnostic(Range(Position(i, 0), Position(i, 1)), f"e{i}", DiagnosticSeverity.ERROR)
+                for i in range(5)
+            ]
+        })
+
+        from ada_mcp.server import call_tool
+        result = await call_tool("ada_diagnostics", {"offset": 1, "limit": 2})
+        data = json.loads(result[0].text)
+        assert [d["message"] for d in data["diagnostics"]] == ["e1", "e2"]
+        assert data["errorCount"] == 5
+        assert data["totalCount"] == 5
+        assert data["truncated"] is True
+
+        result = await call_tool("ada_diagnostics", {"offset": 3, "limit": 10})
+        data = json.loads(result[0].text)
+        assert [d["message"] for d in data["diagnostics"]] == ["e3", "e4"]
+        assert data["truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_diagnostics_since_version(self, mock_get_als):
+        """Test polling with since_version short-circuits until a new publish."""
+        from ada_mcp.als.types import Diagnostic, Position, Range
+        uri = "file:///project/src/main.adb"
+        span = Range(Position(0, 0), Position(0, 1))
+        mock_get_als._diagnostics = DiagnosticStore({uri: [Diagnostic(span, "first")]})
+
+        from ada_mcp.server import call_tool
+        result = await call_tool("ada_diagnostics", {})
+        version = json.loads(result[0].text)["version"]
+
+        result = await call_tool("ada_diagnostics", {"since_version": version})
+        assert json.loads(result[0].text) == {"unchanged": True, "version": version}
+
+        mock_get_als._diagnostics[uri] = [Diagnostic(span, "second")]
+        result = await call_tool("ada_diagnostics", {"since_version": version})
+        data = json.loads(result[0].text)
+        assert data["version"] != version
+        assert [d["message"] for d in data["diagnostics"]] == ["second"]
+
+    @pytest.mark.asyncio
+    async def test_diagnostics_since_version_from_other_store(self, mock_get_als):
+        """Test a token from a replaced store never matches the new one."""
+        from ada_mcp.als.types import Diagnostic, Position, Range
+        uri = "file:///project/src/main.adb"
+        span = Range(Position(0, 0), Position(0, 1))
+        mock_get_als._diagnostics = DiagnosticStore({uri: [Diagnostic(span, "old")]})
+
+        from ada_mcp.server import call_tool
+        result = await call_tool("ada_diagnostics", {})
+        version = json.loads(result[0].text)["version"]
+
+        # A restarted server starts a new store whose counter reaches the same value
+        mock_get_als._diagnostics = DiagnosticStore({uri: [Diagnostic(span, "new")]})
+        assert mock_get_als._diagnostics.version == 1
+
+        result = await call_tool("ada_diagnostics", {"since_version": version})
+        data = json.loads(result[0].text)
+        assert "unchanged" not in data
+        assert [d["message"] for d in data["diagnostics"]] == ["new"]
+
+    @pytest.mark.asyncio
+    async def test_diagnostics_single_file_skips_other_files(self, mock_get_als):
+        """Test a file filter looks up that file's entries without visiting others."""
+        from ada_mcp.als.types import Diagnostic, DiagnosticSeverity, Position, Range
+        span = Range(Position(0, 0), Position(0, 1))
+        mock_get_als._diagnostics = DiagnosticStore({
+            f"file:///project/src/unit{i}.adb": [
+                Diagnostic(span, f"e{i}", DiagnosticSeverity.ERROR)
+            ]
+            for i in range(50)
+        })
+
+        from ada_mcp.server import call_tool
+        with patch("ada_mcp.tools.diagnostics.uri_to_file", side_effect=lambda u: u[7:]) as conv:
+            result = await call_tool("ada_diagnostics", {
+                "file": "/project/src/unit7.adb",
+                "severity": "error",
+            })
+
+        data = json.loads(result[0].text)
+        assert [d["message"] for d in data["diagnostics"]] == ["e7"]
+        assert conv.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_diagnostics_records_reused_until_republish(self, mock_get_als):
+        """Test converted records are built once per publish and then reused."""
+        from ada_mcp.als.types import Diagnostic, Position, Range
+        uri = "file:///project/src/main.adb"
+        mock_get_als._diagnostics = DiagnosticStore({
+            uri: [Diagnostic(Range(Position(0, 0), Position(0, 1)), "first")]
+        })
+
+        from ada_mcp.server import call_tool
+        with patch("ada_mcp.tools.diagnostics.uri_to_file", return_value="/main.adb") as conv:
+            await call_tool("ada_diagnostics", {"severity": "all"})
+            await call_tool("ada_diagnostics", {"severity": "all"})
+            assert conv.call_count == 1
+
+            mock_get_als._diagnostics[uri] = [
+                Diagnostic(Range(Position(3, 0), Position(3, 1)), "second")
+            ]
+            result = await call_tool("ada_diagnostics", {"severity": "all"})
+            assert conv.call_count == 2
+
+        data = json.loads(result[0].text)
+        assert [d["message"] for d in data["diagnostics"]] == ["second"]
+        assert data["diagnostics"][0]["line"] == 4
 
 # ============================================================================
 # Input Validation Tests
@@ -471,8 +832,7 @@ class TestInputValidation:
     @pytest.mark.asyncio
     async def test_hover_empty_file_path(self, mock_get_als):
         """Test hover with empty file path."""
-        # Empty file paths convert to current directory, which is invalid
-        # The handler logs a warning but proceeds; mock returns a result anyway
+        # Empty file paths are rejected before reaching ALS
         mock_get_als.send_request.return_value = None
         
         from ada_mcp.server import call_tool
@@ -483,13 +843,36 @@ class TestInputValidation:
         })
 
         data = json.loads(result[0].text)
-        # Should return not found (mock returns None)
         assert "found" in data or "error" in data
+        mock_get_als.send_request.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_hover_blank_file_path(self, mock_get_als):
+        """Test a whitespace-only path is rejected like an empty one."""
+        from ada_mcp.server import call_tool
+        result = await call_tool("ada_hover", {"file": "   ", "line": 5, "column": 1})
+
+        data = json.loads(result[0].text)
+        assert data["found"] is False
+        assert data["error"] == "File path is required"
+        mock_get_als.send_request.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_references_empty_file_path(self, mock_get_als):
+        """Test find_references rejects an empty path without contacting ALS."""
+        from ada_mcp.server import call_tool
+        result = await call_tool("ada_find_references", {"file": "", "line": 5, "column": 1})
+
+        data = json.loads(result[0].text)
+        assert data["references"] == []
+        assert data["count"] == 0
+        assert "error" in data
+        mock_get_als.send_request.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_diagnostics_invalid_severity(self, mock_get_als):
         """Test diagnostics with invalid severity filter."""
-        mock_get_als._diagnostics = {}
+        mock_get_als._diagnostics = DiagnosticStore({})
         
         from ada_mcp.server import call_tool
         result = await call_tool("ada_diagnostics", {
@@ -559,3 +942,40 @@ class TestFilePathHandling:
         # File should be a path, not a URI
         assert not data["file"].startswith("file://")
         assert data["file"].startswith("/")
+
+    @pytest.mark.parametrize("uri,expected", [
+        ("file:///project/src/main.adb", "/project/src/main.adb"),
+        ("file:///project/my%20src/main.adb", "/project/my src/main.adb"),
+        ("file://localhost/project/main.adb", "/project/main.adb"),
+    ])
+    def test_uri_to_file_fast_and_parsed_paths(self, uri, expected):
+        """Test plain and host-qualified URIs convert to the same style of path."""
+        from ada_mcp.utils.uri import uri_to_file
+
+        assert uri_to_file(uri) == expected
+        assert uri_to_file(uri) == expected  # Served from the cache
+
+    @pytest.mark.parametrize("uri,expected", [
+        ("file:///project/src/main.adb", "file:///project/src/main.adb"),
+        ("file:///project/my%20src/main.adb", "file:///project/my%20src/main.adb"),
+        ("file://localhost/project/main.adb", "file:///project/main.adb"),
+    ])
+    def test_file_to_uri_accepts_uri(self, uri, expected):
+        """Test a URI passed as a file is normalized, not resolved as a relative path."""
+        from ada_mcp.utils.uri import file_to_uri
+
+        assert file_to_uri(uri) == expected
+
+    def test_file_to_uri_follows_retargeted_symlink(self, tmp_path):
+        """Test a symlink is resolved again after it is pointed elsewhere."""
+        from ada_mcp.utils.uri import file_to_uri
+
+        (tmp_path / "a.adb").write_text("")
+        (tmp_path / "b.adb").write_text("")
+        link = tmp_path / "main.adb"
+        link.symlink_to(tmp_path / "a.adb")
+        assert file_to_uri(str(link)) == (tmp_path / "a.adb").resolve().as_uri()
+
+        link.unlink()
+        link.symlink_to(tmp_path / "b.adb")
+        assert file_to_uri(str(link)) == (tmp_path / "b.adb").resolve().as_uri()
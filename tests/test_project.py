@@ -2,7 +2,7 @@
 
 import pytest
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 
 from ada_mcp.tools.project import (
     parse_gpr_file,
@@ -28,14 +28,6 @@ def sample_ada_file():
     return Path(__file__).parent / "fixtures" / "sample_project" / "src" / "main.adb"
 
 
-@pytest.fixture
-def mock_als_client():
-    """Create a mock ALS client."""
-    client = AsyncMock()
-    client.send_request = AsyncMock()
-    return client
-
-
 # ============================================================================
 # GPR File Parser Tests (Task 3.1)
 # ============================================================================
@@ -82,6 +74,23 @@ end Multi;
         assert "lib" in result["source_dirs"]
         assert len(result["main_units"]) == 2
 
+    def test_parse_gpr_cached_until_file_changes(self, tmp_path):
+        """Test repeated parses reuse the cached result until the file changes."""
+        import os
+
+        gpr_file = tmp_path / "cached.gpr"
+        gpr_file.write_text('project Cached is\n   for Source_Dirs use ("src");\nend Cached;\n')
+
+        first = parse_gpr_file(gpr_file)
+        first["source_dirs"].append("mutated")
+        with patch.object(Path, "read_text", side_effect=AssertionError("re-read")):
+            assert parse_gpr_file(gpr_file)["source_dirs"] == ["src"]
+
+        gpr_file.write_text('project Renamed is\nend Renamed;\n')
+        os.utime(gpr_file, ns=(1, 1))
+
+        assert parse_gpr_file(gpr_file)["project_name"] == "Renamed"
+
 
 # ============================================================================
 # ada_project_info Tests (Task 3.2)
@@ -112,7 +121,17 @@ class TestProjectInfo:
             assert Path(src_dir).is_absolute()
         if result["object_dir"]:
             assert Path(result["object_dir"]).is_absolute()
-    
+
+    @pytest.mark.asyncio
+    async def test_project_info_relative_gpr_path(self, sample_gpr_path, monkeypatch):
+        """Test a relative project path resolves the same as an absolute one."""
+        absolute = await handle_project_info(str(sample_gpr_path))
+        monkeypatch.chdir(sample_gpr_path.parent.parent)
+
+        relative = await handle_project_info(f"{sample_gpr_path.parent.name}/sample.gpr")
+
+        assert relative == absolute
+
     @pytest.mark.asyncio
     async def test_project_info_nonexistent(self):
         """Test project info for non-existent file."""
@@ -233,7 +252,36 @@ class TestCallHierarchy:
         assert len(result["incoming_calls"]) == 1
         assert result["outgoing_count"] == 1
         assert result["incoming_count"] == 1
-    
+
+    @pytest.mark.asyncio
+    async def test_call_hierarchy_both_concurrent(self, mock_als_client):
+        """Test outgoing and incoming calls are in flight at the same time."""
+        import asyncio
+
+        in_flight = []
+        peak = 0
+
+        async def send_request(method, params):
+            nonlocal peak
+            if method == "textDocument/prepareCallHierarchy":
+                return [{"name": "Process", "uri": "file:///test/process.adb"}]
+            in_flight.append(method)
+            peak = max(peak, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(method)
+            key = "to" if method == "callHierarchy/outgoingCalls" else "from"
+            return [{key: {"name": method, "uri": "file:///test/x.adb"}}]
+
+        mock_als_client.send_request.side_effect = send_request
+
+        result = await handle_call_hierarchy(
+            mock_als_client, "/test/process.adb", line=11, column=13, direction="both"
+        )
+
+        assert peak == 2
+        assert result["outgoing_calls"][0]["name"] == "callHierarchy/outgoingCalls"
+        assert result["incoming_calls"][0]["name"] == "callHierarchy/incomingCalls"
+
     @pytest.mark.asyncio
     async def test_call_hierarchy_not_found(self, mock_als_client):
         """Test call hierarchy when symbol not found."""
@@ -312,6 +360,43 @@ end Main;
         assert "Ada.Strings" in deps
         assert "Utils" in deps
     
+    @pytest.mark.asyncio
+    async def test_dependency_graph_utf8_names_and_crlf(self, tmp_path):
+        """Test non-ASCII unit names and CRLF line endings are scanned intact."""
+        ada_file = tmp_path / "donnees.ads"
+        ada_file.write_bytes(
+            "with Ada.Text_IO,\r\n     Données;\r\npackage Élément is\r\nend Élément;\r\n".encode()
+        )
+
+        result = await handle_dependency_graph(str(ada_file))
+
+        dep = result["dependencies"][0]
+        assert dep["package"] == "Élément"
+        assert dep["depends_on"] == ["Ada.Text_IO", "Données"]
+
+    @pytest.mark.asyncio
+    async def test_dependency_graph_uses_scan_pool(self, tmp_path):
+        """Test files are scanned on the shared scan executor threads."""
+        import threading
+
+        from ada_mcp.tools import project
+
+        for name in ("a", "b", "c"):
+            (tmp_path / f"{name}.ads").write_text(f"with Ada.Text_IO;\npackage {name} is end;\n")
+        scan_unit = project._scan_unit
+        threads = []
+
+        def recording_scan(ada_file):
+            threads.append(threading.current_thread().name)
+            return scan_unit(ada_file)
+
+        with patch("ada_mcp.tools.project._scan_unit", side_effect=recording_scan):
+            result = await handle_dependency_graph(str(tmp_path))
+
+        assert result["package_count"] == 3
+        assert len(threads) == 3
+        assert all(name.startswith("ada-scan") for name in threads)
+
     @pytest.mark.asyncio
     async def test_dependency_graph_nonexistent(self):
         """Test dependency graph for non-existent path."""
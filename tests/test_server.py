@@ -1,13 +1,26 @@
 """Tests for the MCP server module."""
 
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
 import pytest
 
+from ada_mcp.als.types import Diagnostic, Position, Range, SymbolKind
+from ada_mcp.server import (
+    _NOT_FOUND_CONTENT,
+    _TOOL_HANDLERS,
+    _call_tool_raw,
+    call_tool,
+    list_tools,
+)
+from ada_mcp.tools.diagnostics import DiagnosticRecord
+from ada_mcp.utils import jsonio
+
 
 @pytest.mark.asyncio
 async def test_list_tools():
     """Test that list_tools returns expected tools."""
-    from ada_mcp.server import list_tools
-
     tools = await list_tools()
 
     assert len(tools) >= 3
@@ -20,24 +33,31 @@ async def test_list_tools():
 @pytest.mark.asyncio
 async def test_call_tool_unknown():
     """Test that calling unknown tool returns error."""
-    import json
+    result = await _call_tool_raw("unknown_tool", {})
 
-    from ada_mcp.server import call_tool
+    assert result["error"] == "Unknown tool: unknown_tool"
 
-    result = await call_tool("unknown_tool", {})
 
-    assert len(result) == 1
-    data = json.loads(result[0].text)
-    assert "error" in data
+@pytest.mark.asyncio
+async def test_every_listed_tool_has_handler():
+    """Test the dispatch table covers exactly the advertised tools."""
+    tools = await list_tools()
+
+    assert {t.name for t in tools} == set(_TOOL_HANDLERS)
 
 
 @pytest.mark.asyncio
-async def test_call_tool_goto_definition():
-    """Test ada_goto_definition tool call."""
-    import json
+async def test_call_tool_unknown_skips_als():
+    """Test unknown tools are rejected without starting ALS."""
+    with patch("ada_mcp.server.get_als_client", new=AsyncMock()) as get_client:
+        await call_tool("unknown_tool", {})
 
-    from ada_mcp.server import call_tool
+    get_client.assert_not_called()
 
+
+@pytest.mark.asyncio
+async def test_call_tool_goto_definition():
+    """Test ada_goto_definition tool call."""
     result = await call_tool(
         "ada_goto_definition",
         {
@@ -51,3 +71,101 @@ async def test_call_tool_goto_definition():
     data = json.loads(result[0].text)
     # Currently returns "not implemented" - update when ALS is integrated
     assert "found" in data or "error" in data
+
+
+@pytest.mark.asyncio
+async def test_call_tool_text_same_without_orjson(monkeypatch):
+    """Test call_tool emits the same text whichever JSON backend is active."""
+    if jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+
+    (fast,) = await call_tool("unknown_tool_élément", {})
+    monkeypatch.setattr(jsonio, "orjson", None)
+    (plain,) = await call_tool("unknown_tool_élément", {})
+
+    assert fast.text == plain.text
+    assert "élément" in plain.text
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_jsonio_roundtrip(use_orjson, monkeypatch):
+    """Test jsonio produces the same documents with and without orjson."""
+    if not use_orjson:
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+
+    payload = {"file": "main.adb", "diagnostics": [{"line": 1, "message": "é"}]}
+
+    text = jsonio.dumps(payload, indent=True)
+
+    assert json.loads(text) == payload
+    assert "\n  " in text
+    assert jsonio.loads(text.encode("utf-8")) == payload
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_jsonio_encodes_paths_and_enums(use_orjson, monkeypatch):
+    """Test records, paths, enums and sets are encoded the same with either backend."""
+    if not use_orjson:
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+
+    record = DiagnosticRecord("/p/main.adb", 1, 2, 1, 5, "error", "bad", None, "ada")
+    text = jsonio.dumps(
+        {"file": Path("/p/main.adb"), "kind": SymbolKind.PACKAGE, "ids": {1}, "diag": record}
+    )
+
+    assert json.loads(text) == {
+        "file": "/p/main.adb",
+        "kind": 4,
+        "ids": [1],
+        "diag": {
+            "file": "/p/main.adb",
+            "line": 1,
+            "column": 2,
+            "endLine": 1,
+            "endColumn": 5,
+            "severity": "error",
+            "message": "bad",
+            "code": None,
+            "source": "ada",
+        },
+    }
+    with pytest.raises(TypeError):
+        jsonio.dumps({"bad": object()})
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_jsonio_encodes_lsp_ranges(use_orjson, monkeypatch):
+    """Test ranges, alone or nested in other types, encode in LSP start/end shape."""
+    if not use_orjson:
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+
+    span = Range(Position(4, 10), Position(5, 2))
+    lsp_span = {"start": {"line": 4, "character": 10}, "end": {"line": 5, "character": 2}}
+
+    text = jsonio.dumps({"range": span, "diagnostics": [Diagnostic(span, "bad")]})
+
+    assert json.loads(text) == {
+        "range": lsp_span,
+        "diagnostics": [
+            {"range": lsp_span, "message": "bad", "severity": 1, "code": None, "source": None}
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_call_tool_not_found_reuses_encoded_content():
+    """Test bare not-found results are served from the pre-encoded constant."""
+    client = AsyncMock()
+    client.send_request.return_value = None
+    args = {"file": "/nonexistent/main.adb", "line": 1, "column": 1}
+    with patch("ada_mcp.server.get_als_client", return_value=client):
+        result = await call_tool("ada_type_definition", args)
+
+    assert result[0] is _NOT_FOUND_CONTENT
+    assert json.loads(result[0].text) == {"found": False}